@@ -2,13 +2,32 @@ from ._version import get_versions
 __version__ = get_versions()['version']
 del get_versions
 
-from andes import io  # NOQA
-from andes.main import run, load  # NOQA
-from andes import system  # NOQA
-from andes.system import System  # NOQA
-
+import importlib  # NOQA
 
 __author__ = 'Hantao Cui'
 
 __all__ = ['main', 'plot', 'system', 'cli',
            'utils', 'core', 'models', 'io', 'routines', 'variables']
+
+# objects imported from submodules on the first access
+_lazy_objects = {'System': 'andes.system',
+                 'run': 'andes.main',
+                 'load': 'andes.main',
+                 }
+
+
+def __getattr__(name):
+    # import submodules and objects on the first access so that `import andes` stays light for the CLI
+    if name in _lazy_objects:
+        value = getattr(importlib.import_module(_lazy_objects[name]), name)
+    elif name in __all__:
+        value = importlib.import_module(f'{__name__}.{name}')
+    else:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_lazy_objects))
@@ -0,0 +1,231 @@
+"""
+Startup benchmarks with budget checks.
+
+Each measurement runs in a fresh Python process so that the import caches of the current process do not
+hide the startup cost. The measured stages are
+
+- ``import``: ``import andes``,
+- ``help``: ``andes --help``,
+- ``<case>.system``, ``<case>.undill``, ``<case>.parse`` and ``<case>.setup``: ``System()`` construction,
+  deserializing the calls, parsing and ``System.setup`` for each reference case. The calls of a model are
+  deserialized when the model is imported in parsing. That time is counted in ``undill`` and not in ``parse``.
+
+The minimum wall time in seconds over the repeats is reported for each stage. Results are written to a JSON
+file, and the stages exceeding the budgets in a JSON file of ``{stage: seconds}`` fail the benchmark. The
+default budgets in ``bench-budgets.json`` leave headroom for slower machines than the one they were measured on.
+"""
+
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+from time import perf_counter, strftime
+
+from andes.utils.paths import get_case
+
+logger = logging.getLogger(__name__)
+
+# reference cases by name
+cases = {'ieee14': 'ieee14/case14.xlsx',
+         'kundur': 'kundur/kundur_full.xlsx',
+         'case2383wp': 'matpower/case2383wp.m',
+         'case13659pegase': 'matpower/case13659pegase.m',
+         }
+
+# default budgets shipped with the package
+default_budget = os.path.join(os.path.dirname(__file__), 'bench-budgets.json')
+
+_case_script = 'import sys, json; from andes.bench import profile_case; ' \
+               'print(json.dumps(profile_case(sys.argv[1])))'
+
+
+def _wall_time(args):
+    """
+    Run a command and return the wall time in seconds.
+    """
+    t0 = perf_counter()
+    subprocess.run(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    return perf_counter() - t0
+
+
+def profile_case(case):
+    """
+    Measure the wall times of ``System()``, deserializing the calls, parsing and setup for a case in this process.
+
+    ``undill`` includes ``System.undill_calls`` and the ``System.load_calls`` of the models imported later.
+
+    Parameters
+    ----------
+    case : str
+        Path to the case file
+
+    Returns
+    -------
+    dict
+        ``{stage: seconds}`` for the stages ``system``, ``undill``, ``parse`` and ``setup``
+    """
+    from andes.system import System
+    from andes.io import parse
+
+    out = dict()
+    t0 = perf_counter()
+    system = System(case=case, options={'no_output': True})
+    out['system'] = perf_counter() - t0
+
+    # time of deserializing calls on model imports, moved from `parse` and `setup` to `undill`
+    load_time = [0.0]
+    load_calls = system.load_calls
+
+    def timed_load_calls(*args, **kwargs):
+        t1 = perf_counter()
+        load_calls(*args, **kwargs)
+        load_time[0] += perf_counter() - t1
+
+    system.load_calls = timed_load_calls
+
+    t0 = perf_counter()
+    system.undill_calls()
+    out['undill'] = perf_counter() - t0
+
+    load_time[0] = 0.0
+    t0 = perf_counter()
+    if not parse(system):
+        raise ValueError(f'Unable to parse case <{case}>')
+    out['parse'] = perf_counter() - t0 - load_time[0]
+    out['undill'] += load_time[0]
+
+    load_time[0] = 0.0
+    t0 = perf_counter()
+    system.setup()
+    out['setup'] = perf_counter() - t0 - load_time[0]
+    out['undill'] += load_time[0]
+
+    return out
+
+
+def run(names=None, repeat=3):
+    """
+    Run the startup benchmarks, each in a fresh process.
+
+    Parameters
+    ----------
+    names : list, optional
+        Names of the reference cases in ``cases``, or paths to case files. All reference cases if None.
+    repeat : int
+        Number of runs for each measurement
+
+    Returns
+    -------
+    dict
+        ``{stage: seconds}`` with the minimum time over the runs
+    """
+    names = list(cases) if names is None else names
+    repeat = max(repeat, 1)
+    results = dict()
+
+    results['import'] = min(_wall_time([sys.executable, '-c', 'import andes']) for _ in range(repeat))
+    results['help'] = min(_wall_time([sys.executable, '-m', 'andes', '--help']) for _ in range(repeat))
+
+    for name in names:
+        path = get_case(cases[name]) if name in cases else name
+        if name not in cases:
+            name = os.path.splitext(os.path.basename(name))[0]
+
+        for _ in range(repeat):
+            ret = subprocess.run([sys.executable, '-c', _case_script, path],
+                                 stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True)
+            for stage, val in json.loads(ret.stdout.decode().splitlines()[-1]).items():
+                key = f'{name}.{stage}'
+                results[key] = min(results.get(key, val), val)
+        logger.info(f'Case <{name}> finished.')
+
+    return results
+
+
+def load_budgets(path=None):
+    """
+    Load the budgets from a JSON file of ``{stage: seconds}``.
+
+    Parameters
+    ----------
+    path : str, optional
+        Path to the JSON file. ``default_budget`` if None.
+
+    Returns
+    -------
+    dict
+        ``{stage: seconds}``
+    """
+    with open(default_budget if path is None else path, 'r') as f:
+        return json.load(f)
+
+
+def check(results, budgets):
+    """
+    Check the results against the budgets.
+
+    Parameters
+    ----------
+    results : dict
+        ``{stage: seconds}`` returned by ``run``
+    budgets : dict
+        ``{stage: seconds}`` of the maximum times. Stages not measured are skipped.
+
+    Returns
+    -------
+    list
+        ``(stage, seconds, budget)`` of the stages exceeding the budgets
+    """
+    return [(stage, results[stage], budget) for stage, budget in budgets.items()
+            if stage in results and results[stage] > budget]
+
+
+def bench(names=None, repeat=3, output=None, budget=None):
+    """
+    Run the startup benchmarks, write the results to a JSON file and check the budgets.
+
+    Parameters
+    ----------
+    names : list, optional
+        Reference case names or case paths. All reference cases if None.
+    repeat : int
+        Number of runs for each measurement
+    output : str, optional
+        Path to the JSON file of results
+    budget : str, optional
+        Path to the JSON file of budgets in ``{stage: seconds}``. ``default_budget`` if None.
+
+    Returns
+    -------
+    bool
+        True if all budgets are met, False otherwise
+    """
+    from andes import __version__ as version
+
+    results = run(names, repeat=repeat)
+    budgets = load_budgets(budget)
+    failed = check(results, budgets)
+
+    for stage, val in results.items():
+        limit = f' (budget {budgets[stage]:.4f})' if stage in budgets else ''
+        logger.info(f'{stage:>24s}: {val:.4f} s{limit}')
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump({'version': version,
+                       'python': platform.python_version(),
+                       'platform': platform.platform(),
+                       'time': strftime('%Y-%m-%d %H:%M:%S'),
+                       'repeat': repeat,
+                       'results': results,
+                       'budgets': budgets,
+                       'failed': [stage for stage, _, _ in failed],
+                       }, f, indent=2)
+        logger.info(f'Benchmark results written to <{output}>.')
+
+    for stage, val, limit in failed:
+        logger.error(f'<{stage}> took {val:.4f} s, exceeding the budget of {limit:.4f} s.')
+
+    return len(failed) == 0
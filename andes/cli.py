@@ -6,11 +6,20 @@ import platform
 import importlib
 
 from time import strftime
-from andes.main import config_logger
 from andes.utils.paths import get_log_dir
 
 logger = logging.getLogger(__name__)
 
+# functions of subcommands in `module:function`, imported only when the subcommand runs
+command_hooks = {'run': 'andes.main:run',
+                 'plot': 'andes.plot:tdsplot',
+                 'misc': 'andes.main:misc',
+                 'prepare': 'andes.main:prepare',
+                 'doc': 'andes.main:doc',
+                 'selftest': 'andes.main:selftest',
+                 'bench': 'andes.main:bench',
+                 }
+
 
 def create_parser():
     """
@@ -28,6 +37,7 @@ def create_parser():
     sub_parsers = parser.add_subparsers(dest='command', help='[run]: run simulation routine; '
                                                              '[plot]: plot simulation results; '
                                                              '[prepare]: run the symbolic-to-numeric preparation; '
+                                                             '[bench]: run startup benchmarks; '
                                                              '[misc]: miscellaneous functions.'
                                         )
 
@@ -43,6 +53,8 @@ def create_parser():
     run.add_argument('-o', '--output-path', help='Output path prefix', type=str, default='')
     run.add_argument('-n', '--no-output', help='Force no output of any kind', action='store_true')
     run.add_argument('--ncpu', help='Number of parallel processes', type=int, default=os.cpu_count())
+    run.add_argument('--longest-first', help='Start the largest cases first when running multiple cases',
+                     action='store_true')
     run.add_argument('--dime', help='Specify DiME streaming server address and port', type=str)
     run.add_argument('--tf', help='End time of time-domain simulation', type=float)
     run.add_argument('--convert', help='Convert to format.', type=str, default='', nargs='?')
@@ -50,10 +62,12 @@ def create_parser():
                      nargs='?')
     run.add_argument('--add-sheet', help='Add a template sheet for the specified model.', type=str)
     run.add_argument('--profile', action='store_true', help='Enable Python cProfiler')
+    run.add_argument('--cache', action='store_true', help='Load parsed case data from a binary cache')
+    run.add_argument('--export', help='Export TDS results to a columnar format', choices=('parquet', 'feather'))
 
     plot = sub_parsers.add_parser('plot')
     plot.add_argument('filename', nargs=1, default=[], help='data file name.')
-    plot.add_argument('x', nargs=1, type=int, help='x axis variable index')
+    plot.add_argument('x', nargs='?', type=int, default=0, help='x axis variable index')
     plot.add_argument('y', nargs='*', help='y axis variable index')
     plot.add_argument('--xmin', type=float, help='x axis minimum value', dest='left')
     plot.add_argument('--xmax', type=float, help='x axis maximum value', dest='right')
@@ -69,6 +83,10 @@ def create_parser():
     plot.add_argument('--ytimes', type=str, help='y switch_times')
     plot.add_argument('--dpi', type=int, help='image resolution in dot per inch (DPI)')
     plot.add_argument('-c', '--tocsv', help='convert .npy output to a csv file', action='store_true')
+    plot.add_argument('--export', help='export x and y (or all) variables to a columnar format',
+                      choices=('parquet', 'feather'))
+    plot.add_argument('--batch', type=str, help='plot specification file for rendering figures in batch')
+    plot.add_argument('--ncpu', type=int, help='number of processes for batch plotting', default=os.cpu_count())
 
     misc = sub_parsers.add_parser('misc')
     config_exclusive = misc.add_mutually_exclusive_group()
@@ -90,6 +108,15 @@ def create_parser():
 
     selftest = sub_parsers.add_parser('selftest')  # NOQA
 
+    bench = sub_parsers.add_parser('bench')
+    bench.add_argument('case', nargs='*',
+                       help='Reference case names (ieee14, kundur, case2383wp, case13659pegase) '
+                            'or case file paths. All reference cases by default.')
+    bench.add_argument('-r', '--repeat', type=int, default=3, help='Number of runs for each measurement')
+    bench.add_argument('-o', '--output', help='JSON file to write the results to')
+    bench.add_argument('-b', '--budget', help='JSON file of the time budgets in seconds by stage. '
+                                              'The budgets shipped with ANDES by default.')
+
     return parser
 
 
@@ -112,8 +139,18 @@ def preamble():
     logger.info('')
 
 
+def get_hook(command):
+    """
+    Import and return the function of a subcommand from ``command_hooks``.
+    """
+    module, func = command_hooks[command].split(':')
+    return getattr(importlib.import_module(module), func)
+
+
 def main():
     """Main command-line interface"""
+    from andes.main import config_logger
+
     parser = create_parser()
     args = parser.parse_args()
 
@@ -122,11 +159,10 @@ def main():
     preamble()
     logger.debug(args)
 
-    module = importlib.import_module('andes.main')
-
     if args.command is None:
         parser.parse_args(sys.argv.append('--help'))
 
     else:
-        func = getattr(module, args.command)
-        func(**vars(args))
+        func = get_hook(args.command)
+        if func(**vars(args)) is False:
+            sys.exit(1)
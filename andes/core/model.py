@@ -11,8 +11,9 @@ from andes.core.var import BaseVar, Algeb, State, ExtAlgeb, ExtState
 from andes.core.block import Block
 from andes.core.service import BaseService, ConstService, ExtService, OperationService, RandomService
 
-from andes.utils.func import list_flatten
+from andes.utils.func import list_flatten, sorted_index, index_lookup
 from andes.utils.tab import Tab
+from andes.variables.snapshot import copy_into
 
 from andes.shared import np, pd, newton_krylov
 
@@ -96,6 +97,8 @@ class ModelData(object):
         self.n = 0
         self.idx = []
         self.uid = {}
+        self._index = None  # sorted index of `idx` for `get_uid`
+        self._index_n = -1  # number of elements when `_index` was built
 
         if not hasattr(self, 'cache'):
             self.cache = Cache()
@@ -134,6 +137,33 @@ class ModelData(object):
 
         super(ModelData, self).__setattr__(key, value)
 
+    def get_uid(self, idx, allow_missing=False):
+        """
+        Return the uid of a list of idx as an array.
+
+        The idx are looked up in a sorted array of ``self.idx`` with ``searchsorted``. Mixed-type idx
+        are looked up in ``self.uid``.
+
+        Parameters
+        ----------
+        idx : list or np.ndarray
+            idx of the elements
+        allow_missing : bool
+            True to return -1 for idx not found. Otherwise, raise a KeyError.
+        """
+        if self._index_n != self.n:
+            self._index = sorted_index(self.idx)
+            self._index_n = self.n
+
+        uid = index_lookup(self._index, idx) if self._index is not None else None
+        if uid is None:
+            if allow_missing:
+                return np.array([self.uid.get(i, -1) for i in idx], dtype=int)
+            return np.array([self.uid[i] for i in idx], dtype=int)
+        if not allow_missing and np.any(uid < 0):
+            raise KeyError(f'{self.__class__.__name__}: idx {[i for i, u in zip(idx, uid) if u < 0]} not found')
+        return uid
+
     def add(self, idx=None, **kwargs):
         """
         Add a model element using a set of parameters.
@@ -157,6 +187,36 @@ class ModelData(object):
         if len(kwargs) > 0:
             logger.warning(f'{self.__class__.__name__}: Unused data {kwargs}')
 
+    def add_batch(self, idx, **kwargs):
+        """
+        Add multiple model elements using columns of parameters.
+
+        Parameters
+        ----------
+        idx : list
+            reference-able external indices of the new elements
+        kwargs : array-like
+            parameter values of the new elements, one array per parameter
+        """
+        idx = list(idx)
+        n = len(idx)
+        for name, values in kwargs.items():
+            if len(values) != n:
+                raise ValueError(f'{self.__class__.__name__}: length of <{name}> is {len(values)}, expected {n}')
+
+        self.uid.update(zip(idx, range(self.n, self.n + n)))
+        self.idx.extend(idx)
+        self.n += n
+
+        for name, instance in self.params.items():
+
+            # skip `RefParam` because it is collected outside `add`
+            if isinstance(instance, RefParam):
+                continue
+            instance.add_batch(kwargs.pop(name, None), n=n)
+        if len(kwargs) > 0:
+            logger.warning(f'{self.__class__.__name__}: Unused data {list(kwargs.keys())}')
+
     def as_dict(self, vin=False):
         """
         Export all variable parameters as a dict
@@ -431,6 +491,9 @@ class Model(object):
         super(Model, self).__setattr__(key, value)
 
     def idx2uid(self, idx):
+        """
+        Convert idx to uid. A list or array of idx is converted in one call with ``get_uid``.
+        """
         if idx is None:
             logger.error("idx2uid cannot search for None idx")
             return None
@@ -439,7 +502,7 @@ class Model(object):
         elif isinstance(idx, (list, np.ndarray)):
             if len(idx) > 0 and isinstance(idx[0], (list, np.ndarray)):
                 idx = list_flatten(idx)
-            return [self.uid[i] for i in idx]
+            return self.get_uid(idx)
         else:
             raise NotImplementedError(f'Unknown idx type {type(idx)}')
 
@@ -1220,6 +1283,14 @@ class Model(object):
             var.reset()
         self.flags['address'] = False
 
+    def ops_reset(self):
+        """
+        Clear the stored values of ``OperationService`` so that they are recomputed from the current inputs.
+        """
+        for instance in self.services_ops.values():
+            if isinstance(instance, OperationService):
+                instance.reset()
+
     def e_clear(self):
         """
         Clear equation value arrays associated with all internal variables.
@@ -1229,6 +1300,53 @@ class Model(object):
         for instance in self.cache.all_vars.values():
             instance.e[:] = 0
 
+    def get_state(self):
+        """
+        Return copies of the values that may change in a simulation.
+
+        The state includes numerical parameters, services and discrete flags.
+        Variable values are not included since they are restored from DAE.
+
+        Returns
+        -------
+        OrderedDict
+            State to be restored with ``set_state``
+        """
+        state = OrderedDict()
+        state['flags'] = dict(self.flags)
+        if self.n == 0:
+            return state
+
+        state['params'] = OrderedDict((name, np.array(instance.v))
+                                      for name, instance in self.num_params.items())
+        state['services'] = OrderedDict((name, np.array(instance.v))
+                                        for name, instance in self.cache.services_and_ext.items())
+        state['discrete'] = OrderedDict()
+        for name, instance in self.discrete.items():
+            state['discrete'][name] = OrderedDict((flag, np.array(instance.__dict__[flag]))
+                                                  for flag in instance.export_flags)
+        return state
+
+    def set_state(self, state):
+        """
+        Restore the values from ``state`` returned by ``get_state``.
+
+        Arrays are restored in place when possible, and the cached inputs are refreshed.
+        """
+        self.flags.update(state['flags'])
+        if self.n == 0:
+            return
+
+        for name, value in state['params'].items():
+            copy_into(self.num_params[name], 'v', value)
+        for name, value in state['services'].items():
+            copy_into(self.cache.services_and_ext[name], 'v', value)
+        for name, flags in state['discrete'].items():
+            for flag, value in flags.items():
+                copy_into(self.discrete[name], flag, value)
+
+        self.get_inputs(refresh=True)
+
     def v_numeric(self, **kwargs):
         """
         Custom variable initialization function.
@@ -90,6 +90,37 @@ class BaseParam(object):
         else:
             np.append(self.v, value)
 
+    def add_batch(self, values=None, n=0):
+        """
+        Add the values of multiple new elements to the ``v`` list.
+
+        Parameters
+        ----------
+        values : array-like, optional
+            Parameter values of the new elements. ``None`` or ``math.nan`` entries are set to the default.
+            If None, the default is used for all the ``n`` elements.
+        n : int
+            Number of new elements, used only when ``values`` is None
+
+        See Also
+        --------
+        BaseParam.add : add method for a single element
+        """
+        if values is None:
+            values = [None] * n
+        elif hasattr(values, 'tolist'):
+            values = values.tolist()
+
+        if any(issubclass(item, float) for item in set(map(type, values))):
+            values = [None if (isinstance(item, float) and math.isnan(item)) else item for item in values]
+
+        if None in values:
+            if self.get_property('mandatory'):
+                raise ValueError(f'Mandatory parameter {self.name} for {self.owner.class_name} missing')
+            values = [self.default if item is None else item for item in values]
+
+        self.v.extend(values)
+
     def get_property(self, property_name: str):
         """
         Check the boolean value of the given property. If the property does not exist in the dictionary,
@@ -312,6 +343,56 @@ class NumParam(BaseParam):
 
         super(NumParam, self).add(value)
 
+    def add_batch(self, values=None, n=0):
+        """
+        Add the values of multiple new elements to the value list.
+
+        The checks of ``NumParam.add`` for missing, mandatory and non-zero values are performed on arrays.
+
+        Parameters
+        ----------
+        values : array-like, optional
+            Parameter values of the new elements. If None, the default is used for all the ``n`` elements.
+        n : int
+            Number of new elements, used only when ``values`` is None
+
+        See Also
+        --------
+        NumParam.add : add method for a single element
+        """
+        if values is None:
+            super(NumParam, self).add_batch(None, n=n)
+            return
+
+        arr = np.asarray(values)
+        if arr.dtype.kind not in 'biuf':
+            try:
+                arr = arr.astype(float)
+            except (TypeError, ValueError):
+                # fall back to the element-wise checks for the error message
+                for item in values:
+                    self.add(item)
+                return
+
+        v = arr.tolist()
+        replace = np.zeros(len(v), dtype=bool)
+        if arr.dtype.kind == 'f':
+            missing = np.isnan(arr)
+            if missing.any() and self.get_property('mandatory'):
+                raise ValueError(f'Mandatory parameter {self.name} missing')
+            replace |= missing
+
+        if self.get_property('non_zero'):
+            zero = (arr == 0)
+            if zero.any():
+                logger.warning(f'Parameter {self.name} of {self.owner.class_name} must be non-zero')
+                replace |= zero
+
+        for i in np.flatnonzero(replace):
+            v[i] = self.default
+
+        self.v.extend(v)
+
     def to_array(self):
         """
         Convert ``v`` to np.ndarray after adding elements.
@@ -465,7 +546,18 @@ class ExtParam(NumParam):
         self.indexer = indexer
         self.parent_model = None   # parent model instance
 
-    def link_external(self, ext_model):
+    @property
+    def indexer_idx(self):
+        """
+        The idx in ``indexer`` to retrieve from the parent model or group, or None if ``indexer`` is None.
+        """
+        if self.indexer is None:
+            return None
+        if isinstance(self.indexer, RefParam) and self.indexer.offsets is not None:
+            return self.indexer.flat
+        return self.indexer.v
+
+    def link_external(self, ext_model, uid=None):
         """
         Update parameter values provided by external models. This needs to be called before pu conversion.
 
@@ -475,17 +567,22 @@ class ExtParam(NumParam):
         ----------
         ext_model : Model, Group
             Instance of the parent model or group, provided by the System calling this method.
+        uid : np.ndarray or tuple, optional
+            ``ext_model.idx2uid(self.indexer_idx)``, or ``idx2mid_uid`` for a group, if already looked up,
+            which can be shared by ``ExtParam`` instances with the same indexer.
 
         """
         self.parent_model = ext_model
+        idx = self.indexer_idx
 
         if isinstance(ext_model, GroupBase):
+            if uid is None:
+                uid = ext_model.idx2mid_uid(idx)
 
-            # TODO: the three lines below is a bit inefficient - 3x same loops
-            self.v = ext_model.get(src=self.src, idx=self.indexer.v, attr='v')
+            self.v = ext_model.get_by_uid(src=self.src, uid=uid, attr='v')
             try:
-                self.vin = ext_model.get(src=self.src, idx=self.indexer.v, attr='vin')
-                self.pu_coeff = ext_model.get(src=self.src, idx=self.indexer.v, attr='vin')
+                self.vin = ext_model.get_by_uid(src=self.src, uid=uid, attr='vin')
+                self.pu_coeff = ext_model.get_by_uid(src=self.src, uid=uid, attr='pu_coeff')
             except KeyError:  # idx param without vin
                 pass
 
@@ -495,14 +592,13 @@ class ExtParam(NumParam):
             parent_instance = ext_model.__dict__[self.src]
             self.property = dict(parent_instance.property)
 
-            if self.indexer is None:
+            if idx is None:
                 # if `idx` is None, retrieve all the values
                 uid = np.arange(ext_model.n)
-            else:
-                if len(self.indexer.v) == 0:
-                    return
-                else:
-                    uid = ext_model.idx2uid(self.indexer.v)
+            elif len(idx) == 0:
+                return
+            elif uid is None:
+                uid = ext_model.idx2uid(idx)
 
             # pull in values
             self.v = parent_instance.v[uid]
@@ -566,6 +662,9 @@ class RefParam(BaseParam):
 
     Then, ``self.Bus.v`` will end up with ``[ [1, 3, 4], [2] ]``.
 
+    The concatenated ``idx`` are also stored in ``self.Bus.flat`` as ``[1, 3, 4, 2]``, and the CSR-style offsets
+    of the sublists in ``self.Bus.offsets`` as ``[0, 3, 4]``.
+
     See Also
     --------
     andes.core.service.ReducerService : A more complete example using RefParam to build the COI model
@@ -574,3 +673,5 @@ class RefParam(BaseParam):
     def __init__(self, **kwargs):
         super(RefParam, self).__init__(**kwargs)
         self.export = False
+        self.flat = []  # collected idx of all sublists in ``v``, concatenated
+        self.offsets = None  # CSR-style offsets of the sublists of ``v`` in ``flat``
@@ -1,6 +1,5 @@
 from typing import Optional, Union, Callable
 from andes.core.param import RefParam, BaseParam
-from andes.utils.func import list_flatten
 from andes.shared import np, ndarray
 
 
@@ -188,6 +187,32 @@ class OperationService(BaseService):
     def v(self, value):
         self._v = value
 
+    @property
+    def offsets(self):
+        """
+        CSR-style offsets of the sublists of ``ref.v`` in the linearly stored values.
+        """
+        if getattr(self.ref, 'offsets', None) is not None:
+            return self.ref.offsets
+        out = np.zeros(len(self.ref.v) + 1, dtype=int)
+        out[1:] = np.cumsum([len(item) for item in self.ref.v])
+        return out
+
+    def reset(self):
+        """
+        Clear the stored values so that ``v`` is recomputed from the current input values.
+        """
+        self._v = None
+
+
+# reduce functions with equivalent ufuncs for ``reduceat``, and whether to divide the results by counts
+_ufunc_reducers = {np.sum: (np.add, False),
+                   np.mean: (np.add, True),
+                   np.max: (np.maximum, False),
+                   np.min: (np.minimum, False),
+                   np.prod: (np.multiply, False),
+                   }
+
 
 class ReducerService(OperationService):
     """
@@ -204,7 +229,9 @@ class ReducerService(OperationService):
     ref : RefParam
         The RefParam whose 2-dimensional shapes are used for indexing
     fun : Callable
-        The callable for converting a 1-D array-like to a scalar
+        The callable for converting a 1-D array-like to a scalar. ``np.sum``, ``np.mean``, ``np.max``,
+        ``np.min``, ``np.prod`` and NumPy ufuncs, such as ``np.add``, are applied to all sublists at once with
+        ``reduceat``. Other callables are called on each sublist.
 
     Examples
     --------
@@ -259,14 +286,29 @@ class ReducerService(OperationService):
         The array ``self._v`` storing the reduced values
         """
         if self._v is None:
-            self._v = np.zeros(len(self.ref.v))
-            idx = 0
-            for i, v in enumerate(self.ref.v):
-                self._v[i] = self.fun(self.u.v[idx:idx + len(v)])
-                idx += len(v)
-            return self._v
-        else:
-            return self._v
+            offsets = self.offsets
+            counts = np.diff(offsets)
+            u = np.asarray(self.u.v)[:offsets[-1]]
+            self._v = np.zeros(len(counts))
+
+            if isinstance(self.fun, np.ufunc):
+                ufunc, mean = self.fun, False
+            else:
+                ufunc, mean = _ufunc_reducers.get(self.fun, (None, False))
+
+            if ufunc is None:
+                for i, (start, end) in enumerate(zip(offsets[:-1], offsets[1:])):
+                    self._v[i] = self.fun(u[start:end])
+            else:
+                nonempty = counts > 0
+                if np.any(nonempty):
+                    self._v[nonempty] = ufunc.reduceat(u, offsets[:-1][nonempty])
+                    if mean:
+                        self._v[nonempty] /= counts[nonempty]
+                if not np.all(nonempty):
+                    self._v[~nonempty] = ufunc.reduce(u[:0]) if self.fun is ufunc else self.fun(u[:0])
+
+        return self._v
 
 
 class RepeaterService(OperationService):
@@ -337,14 +379,9 @@ class RepeaterService(OperationService):
         The array, ``self._v`` storing the repeated values
         """
         if self._v is None:
-            self._v = np.zeros(len(list_flatten(self.ref.v)))
-            idx = 0
-            for i, v in enumerate(self.ref.v):
-                self._v[idx:idx + len(v)] = self.u.v[i]
-                idx += len(v)
-            return self._v
-        else:
-            return self._v
+            self._v = np.repeat(np.asarray(self.u.v, dtype=float), np.diff(self.offsets))
+
+        return self._v
 
 
 class RandomService(ConstService):
@@ -1,6 +1,6 @@
 from typing import Optional, Union, List
 
-from andes.core.param import BaseParam
+from andes.core.param import BaseParam, RefParam
 from andes.models.group import GroupBase
 from andes.shared import np, ndarray
 
@@ -233,7 +233,10 @@ class ExtVar(BaseVar):
         self.parent = ext_model
 
         if isinstance(ext_model, GroupBase):
-            if self.indexer.n > 0 and isinstance(self.indexer.v[0], (list, np.ndarray)):
+            if isinstance(self.indexer, RefParam) and self.indexer.offsets is not None:
+                self._n = np.diff(self.indexer.offsets).tolist()  # number of elements in each sublist
+                self._idx = self.indexer.flat
+            elif self.indexer.n > 0 and isinstance(self.indexer.v[0], (list, np.ndarray)):
                 self._n = [len(i) for i in self.indexer.v]  # number of elements in each sublist
                 self._idx = np.concatenate([np.array(i) for i in self.indexer.v])
             else:
@@ -248,10 +251,12 @@ class ExtVar(BaseVar):
         else:
             original_var = ext_model.__dict__[self.src]
 
-            if self.indexer is not None:
-                uid = ext_model.idx2uid(self.indexer.v)
-            else:
+            if self.indexer is None:
                 uid = np.arange(ext_model.n, dtype=int)
+            elif isinstance(self.indexer, RefParam) and self.indexer.offsets is not None:
+                uid = ext_model.idx2uid(self.indexer.flat)
+            else:
+                uid = ext_model.idx2uid(self.indexer.v)
 
             self._n = [len(uid)]
             if len(uid) > 0:
@@ -3,7 +3,7 @@ import logging
 import os
 
 from andes.utils.misc import elapsed
-from andes.io import xlsx, dome, psse   # NOQA
+from andes.io import xlsx, dome, psse, cache   # NOQA
 
 
 logger = logging.getLogger(__name__)
@@ -94,6 +94,16 @@ def parse(system):
     input_format = system.files.input_format
     add_format = system.files.add_format
 
+    # load parsed data from the binary cache if enabled
+    cache_path = None
+    if system.options.get('cache', False):
+        cache_path = cache.get_path(system)
+        if cache.read(system, cache_path):
+            _, s = elapsed(t)
+            logger.info(f'Input file {system.files.fullname} loaded from cache in {s}.')
+            return True
+        config_before = dict(system.config.as_dict(refresh=True))
+
     # exit if the format parser could not be imported
     try:
         parser = importlib.import_module('.' + input_format, __name__)
@@ -131,6 +141,11 @@ def parse(system):
             logger.error('Error parsing dynfile {:s} with dm format parser.'.format(system.files.dynfile))
             return False
 
+    if cache_path is not None:
+        config = {key: val for key, val in system.config.as_dict(refresh=True).items()
+                  if repr(config_before.get(key)) != repr(val)}
+        cache.write(system, cache_path, config=config)
+
     _, s = elapsed(t)
     logger.info(f'Input file {system.files.fullname} parsed in {s}.')
 
@@ -0,0 +1,193 @@
+"""
+Binary cache of parsed case data.
+
+The parsed values of all model parameters are stored in an uncompressed ``.npz`` file in
+``~/.andes/cache``. The file name is a hash of the case files and the ANDES version, so that
+modified inputs or a different ANDES version invalidate the cache.
+
+Only the parsing is cached. Loading from the cache skips the format parser and adds the devices column by
+column with ``System.add_many``, which performs the same checks as parsing. ``System.setup``, including
+the addresses and sparsity patterns, runs in full afterwards.
+
+System attributes set by parsers, such as ``System.mva`` from the MATPOWER ``baseMVA``, are stored with the
+model data.
+
+Columns of a single numeric or string type are stored as native NumPy arrays, and other columns
+(e.g., with ``None`` or mixed types) are stored in the JSON metadata. The file is loaded without pickle.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+
+import andes
+from andes.shared import np
+from andes.utils.paths import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# column types stored as native NumPy arrays; other columns are stored in the JSON metadata
+_native_types = (bool, int, float, str)
+
+# system attributes set by parsers
+_system_fields = ('mva',)
+
+
+def get_path(system):
+    """
+    Return the cache file path for the case files of ``system``.
+
+    The key is the SHA-1 hash of the ANDES version, the input formats and the contents of the
+    case file, the addfile and the dynfile.
+    """
+    files = system.files
+    sha = hashlib.sha1()
+    sha.update(str(andes.__version__).encode())
+    sha.update(f'{files.input_format}|{files.add_format}'.encode())
+
+    for path in (files.case, files.addfile, files.dynfile):
+        if not path:
+            continue
+        sha.update(b'|')
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                sha.update(block)
+
+    return os.path.join(get_cache_dir(), f'{sha.hexdigest()}.npz')
+
+
+def _to_column(values):
+    """
+    Convert a list of values into a native array that restores the same values with ``tolist``.
+
+    Returns
+    -------
+    np.ndarray or None
+        The array, or None if the values are not all of one of the native types
+    """
+    types = set(type(item) for item in values)
+    if len(types) == 1 and types.pop() in _native_types:
+        return np.array(values)
+    return None
+
+
+def _to_json(values):
+    """
+    Convert a list of values into a JSON-compatible list, or return None if not possible.
+    """
+    out = [item.item() if isinstance(item, np.generic) else item for item in values]
+    if all(item is None or type(item) in _native_types for item in out):
+        return out
+    return None
+
+
+def write(system, path, config=None):
+    """
+    Write the parsed model data of ``system`` to the cache file ``path``.
+
+    Must be called after parsing and before ``System.setup``, when parameter values are the raw inputs.
+
+    Parameters
+    ----------
+    system : System
+        The system with parsed data
+    path : str
+        Path to the cache file
+    config : dict, optional
+        System config fields set by the parser
+
+    Returns
+    -------
+    bool
+        True if the cache file is written
+    """
+    arrays = dict()
+    meta = {'version': str(andes.__version__),
+            'config': config if config is not None else {},
+            'system': {key: system.__dict__[key] for key in _system_fields if key in system.__dict__},
+            'models': {},
+            'columns': {},
+            }
+
+    for name, mdl in system.models.items():
+        if mdl.n == 0:
+            continue
+        columns = OrderedDict([('idx', mdl.idx)])
+        for pname, instance in mdl.params.items():
+            # skip `RefParam` and `ExtParam` which are not filled by the parser
+            if not isinstance(instance.v, list) or len(instance.v) != mdl.n:
+                continue
+            columns[pname] = instance.v
+
+        for pname, values in columns.items():
+            key = f'{name}.{pname}'
+            col = _to_column(values)
+            if col is not None:
+                arrays[key] = col
+                continue
+            col = _to_json(values)
+            if col is None:
+                logger.debug(f'Case cache not written: values of <{key}> are not supported.')
+                return False
+            meta['columns'][key] = col
+        meta['models'][name] = list(columns)
+
+    try:
+        arrays['meta'] = np.array(json.dumps(meta))
+        with open(path, 'wb') as f:
+            np.savez(f, **arrays)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning(f'Unable to write case cache <{path}>: {e}')
+        return False
+
+    logger.debug(f'Case data cached to <{path}>.')
+    return True
+
+
+def read(system, path):
+    """
+    Load the model data from the cache file ``path`` into ``system`` with ``System.add_many``.
+
+    Returns
+    -------
+    bool
+        True if the cache is found and loaded, False otherwise.
+    """
+    if not os.path.isfile(path):
+        return False
+
+    try:
+        data = np.load(path, allow_pickle=False)
+    except (OSError, ValueError) as e:
+        logger.warning(f'Unable to read case cache <{path}>: {e}')
+        return False
+
+    with data:
+        try:
+            meta = json.loads(str(data['meta']))
+            if meta['version'] != str(andes.__version__) or \
+                    any(name not in system._model_files for name in meta['models']):
+                return False
+
+            models = OrderedDict()
+            for name, params in meta['models'].items():
+                models[name] = OrderedDict()
+                for pname in params:
+                    key = f'{name}.{pname}'
+                    models[name][pname] = meta['columns'][key] if key in meta['columns'] else data[key].tolist()
+        except (KeyError, ValueError) as e:
+            logger.warning(f'Unable to read case cache <{path}>: {e}')
+            return False
+
+    for name, columns in models.items():
+        system.add_many(name, columns)
+
+    for key, val in meta['config'].items():
+        setattr(system.config, key, val)
+    for key, val in meta.get('system', {}).items():
+        setattr(system, key, val)
+
+    logger.debug(f'Case data loaded from cache <{path}>.')
+    return True
@@ -7,212 +7,178 @@ from andes.shared import deg2rad, np
 
 logger = logging.getLogger(__name__)
 
+# comments start with `%` outside of quoted strings
+comment = re.compile(r"^((?:[^'%\n]|'[^'\n]*')*)%.*$", re.MULTILINE)
+func = re.compile(r'^\s*function\s.*$', re.MULTILINE)
+mva = re.compile(r'^\s*mpc\.baseMVA\s*=\s*([^;\s]+)', re.MULTILINE)
+matrix = re.compile(r'^\s*mpc\.(\w+)\s*=\s*\[(.*?)\]', re.MULTILINE | re.DOTALL)
+cell = re.compile(r'^\s*mpc\.(\w+)\s*=\s*{(.*?)}', re.MULTILINE | re.DOTALL)
+quoted = re.compile(r"'([^'\n]*)'")
+
 
 def testlines(fid):
     return True  # hard coded
 
 
+def _to_array(body):
+    """
+    Convert the body of a MATPOWER matrix into a 2-D array in one shot.
+
+    Rows are separated by semicolons or line breaks. Ragged rows are padded with zeros.
+    """
+    rows = [row for row in re.split(r'[;\n]', body) if row.strip()]
+    if len(rows) == 0:
+        return np.zeros((0, 0))
+
+    values = np.array(body.replace(';', ' ').split(), dtype=float)
+    ncol = len(rows[0].split())
+    if values.size == ncol * len(rows):
+        return values.reshape((len(rows), ncol))
+
+    rows = [np.array(row.split(), dtype=float) for row in rows]
+    out = np.zeros((len(rows), max(len(row) for row in rows)))
+    for i, row in enumerate(rows):
+        out[i, :len(row)] = row
+    return out
+
+
+def _get_matrix(mpc, field, ncol):
+    """
+    Return the matrix ``field`` of ``mpc``, or an empty one with ``ncol`` columns if not found.
+    """
+    out = mpc.get(field)
+    if out is None or len(out) == 0:
+        out = np.zeros((0, ncol))
+    return out
+
+
+def read_mpc(file):
+    """
+    Read a MATPOWER data file into a dict of arrays.
+
+    Returns
+    -------
+    dict
+        ``{field: value}`` with ``baseMVA`` as a float, matrix fields (``bus``, ``gen``, ``branch``, etc.)
+        as 2-D arrays and cell fields (``bus_name``, etc.) as lists of str.
+    """
+    with open(file, 'r') as f:
+        text = f.read()
+
+    # log the first comment line as the case description
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith('%'):
+            logger.info(line[1:])
+            break
+
+    text = comment.sub(r'\1', text)
+    text = func.sub('', text)
+
+    mpc = {'baseMVA': 100.0}
+    found = mva.search(text)
+    if found:
+        mpc['baseMVA'] = float(found.group(1))
+
+    for field, body in matrix.findall(text):
+        mpc[field] = _to_array(body)
+    for field, body in cell.findall(text):
+        mpc[field] = [item.strip() for item in quoted.findall(body)]
+
+    return mpc
+
+
 def read(system, file):
     """Read a MATPOWER data file into mpc and build andes device elements"""
-    func = re.compile(r'function\s')
-    mva = re.compile(r'\s*mpc.baseMVA\s*=\s*')
-    bus = re.compile(r'\s*mpc.bus\s*=\s*\[')
-    gen = re.compile(r'\s*mpc.gen\s*=\s*\[')
-    branch = re.compile(r'\s*mpc.branch\s*=\s*\[')
-    area = re.compile(r'\s*mpc.areas\s*=\s*\[')
-    gencost = re.compile(r'\s*mpc.gencost\s*=\s*\[')
-    bus_name = re.compile(r'\s*mpc.bus_name\s*=\s*{')
-    end = re.compile(r'\s*\];?')
-    has_digit = re.compile(r'.*\d+\s*]?;?')
-    comment = re.compile(r'\s*%.*')
-
-    ret = True
-    field = None
-    info = True
-
-    base_mva = 100
-    mpc = {
-        'bus': [],
-        'gen': [],
-        'branch': [],
-        'area': [],
-        'gencost': [],
-        'bus_name': [],
-    }
-
-    fid = open(file, 'r')
-
-    for line in fid:
-        line = line.strip().rstrip(';')
-        if not line:
-            continue
-        elif func.search(line):  # skip function declaration
-            continue
-        elif comment.search(line):  # for comment lines
-            if info:
-                logger.info(line[1:])
-                info = False
-            else:
-                continue
-        elif mva.search(line):
-            base_mva = float(line.split('=')[1])
-
-        if not field:
-            if bus.search(line):
-                field = 'bus'
-            elif gen.search(line):
-                field = 'gen'
-            elif branch.search(line):
-                field = 'branch'
-            elif area.search(line):
-                field = 'area'
-            elif gencost.search(line):
-                field = 'gencost'
-            elif bus_name.search(line):
-                field = 'bus_name'
-            else:
-                continue
-        elif end.search(line):
-            field = None
-            continue
-
-        # parse mpc sections
-        if field:
-            if line.find('=') >= 0:
-                line = line.split('=')[1]
-            if line.find('[') >= 0:
-                line = re.sub(r'\[', '', line)
-            elif line.find('{') >= 0:
-                line = re.sub(r'{', '', line)
-
-            if line.find('\'') >= 0:  # bus_name
-                line = line.split(';')
-                data = [i.strip('\'').strip() for i in line]
-                mpc['bus_name'].extend(data)
-            else:
-                if not has_digit.search(line):
-                    continue
-                line = line.split(';')
-                for item in line:
-                    data = np.array([float(val) for val in item.split()])
-                    mpc[field].append(data)
-
-    fid.close()
-
-    # convert mpc to np array
-    mpc_array = dict()
-    for key, val in mpc.items():
-        mpc_array[key] = np.array(val)
-
-    # list of buses with slack gen
-    sw = []
-
+    mpc = read_mpc(file)
+    base_mva = mpc['baseMVA']
     system.mva = base_mva
 
-    for data in mpc['bus']:
-        # idx  ty   pd   qd  gs  bs  area  vmag  vang  baseKV  zone  vmax  vmin
-        # 0    1    2   3   4   5    6      7     8     9      10    11    12
-        idx = int(data[0])
-        ty = data[1]
-        if ty == 3:
-            sw.append(idx)
-        pd = data[2] / base_mva
-        qd = data[3] / base_mva
-        gs = data[4] / base_mva
-        bs = data[5] / base_mva
-        area = data[6]
-        vmag = data[7]
-        vang = data[8] * deg2rad
-        baseKV = data[9]
-        if baseKV == 0:
-            baseKV = 110
-        zone = data[10]
-        vmax = data[11]
-        vmin = data[12]
-
-        system.add('Bus', idx=idx, name='Bus ' + str(idx), Vn=baseKV,
-                   v0=vmag, a0=vang,
-                   vmax=vmax, vmin=vmin,
-                   area=area, zone=zone)
-        if pd != 0 or qd != 0:
-            system.add('PQ', bus=idx, name='PQ ' + str(idx), Vn=baseKV, p0=pd, q0=qd)
-        if gs or bs:
-            system.add('Shunt', bus=idx, name='Shunt ' + str(idx), Vn=baseKV, g=gs, b=bs)
-
-    gen_idx = 0
-    for data in mpc['gen']:
-        # bus  pg  qg  qmax  qmin  vg  mbase  status  pmax  pmin  pc1  pc2
-        #  0   1   2    3     4     5    6      7       8    9    10    11
-        # qc1min  qc1max  qc2min  qc2max  ramp_agc  ramp_10  ramp_30  ramp_q
-        #  12      13       14      15      16        17       18      19
-        # apf
-        #  20
-
-        bus_idx = int(data[0])
-        gen_idx += 1
-        vg = data[5]
-        status = int(data[7])
-        mbase = base_mva
-        pg = data[1] / mbase
-        qg = data[2] / mbase
-        qmax = data[3] / mbase
-        qmin = data[4] / mbase
-        pmax = data[8] / mbase
-        pmin = data[9] / mbase
-
-        uid = system.Bus.idx2uid(bus_idx)
-        vn = system.Bus.Vn.v[uid]
-        a0 = system.Bus.a0.v[uid]
-
-        if bus_idx in sw:
-            system.add('Slack', idx=gen_idx, bus=bus_idx, busr=bus_idx,
-                       name='Slack ' + str(bus_idx),
-                       u=status,
-                       Vn=vn, v0=vg, p0=pg, q0=qg, a0=a0,
-                       pmax=pmax, pmin=pmin,
-                       qmax=qmax, qmin=qmin)
-        else:
-            system.add('PV', idx=gen_idx, bus=bus_idx, busr=bus_idx,
-                       name='PV ' + str(bus_idx),
-                       u=status,
-                       Vn=vn, v0=vg, p0=pg, q0=qg,
-                       pmax=pmax, pmin=pmin,
-                       qmax=qmax, qmin=qmin)
-
-    for data in mpc['branch']:
-        # fbus	tbus	r	x	b	rateA	rateB	rateC	ratio	angle
-        #  0     1      2   3   4     5       6       7       8      9
-        # status	angmin	angmax	Pf	Qf	Pt	Qt
-        #   10       11       12    13  14  15  16
-        fbus = data[0]
-        tbus = data[1]
-        r = data[2]
-        x = data[3]
-        b = data[4]
-        status = int(data[10])
-
-        if data[8] == 0.0:  # not a transformer
-            tf = False
-            ratio = 1
-            angle = 0
-        elif data[8] == 1.0 and data[9] == 0.0:  # not a transformer
-            tf = False
-            ratio = 1
-            angle = 0
-        else:
-            tf = True
-            ratio = data[8]
-            angle = data[9] * deg2rad
-
-        vf = system.Bus.Vn.v[system.Bus.idx2uid(fbus)]
-        vt = system.Bus.Vn.v[system.Bus.idx2uid(tbus)]
-        system.add('Line', u=status, name=f'Line {fbus:.0f}-{tbus:.0f}',
-                   Vn1=vf, Vn2=vt,
-                   bus1=fbus, bus2=tbus,
-                   r=r, x=x, b=b,
-                   trans=tf, tap=ratio, phi=angle)
-
-    if len(mpc['bus_name']) == len(system.Bus.name.v):
+    bus = _get_matrix(mpc, 'bus', 13)
+    gen = _get_matrix(mpc, 'gen', 21)
+    branch = _get_matrix(mpc, 'branch', 17)
+
+    # bus
+    # idx  ty   pd   qd  gs  bs  area  vmag  vang  baseKV  zone  vmax  vmin
+    # 0    1    2   3   4   5    6      7     8     9      10    11    12
+    bus_idx = bus[:, 0].astype(int)
+    bus_name = ['Bus ' + str(idx) for idx in bus_idx.tolist()]
+    pd = bus[:, 2] / base_mva
+    qd = bus[:, 3] / base_mva
+    gs = bus[:, 4] / base_mva
+    bs = bus[:, 5] / base_mva
+    vmag = bus[:, 7]
+    vang = bus[:, 8] * deg2rad
+    base_kv = np.where(bus[:, 9] == 0, 110, bus[:, 9])
+
+    system.add_many('Bus', idx=bus_idx, name=bus_name, Vn=base_kv,
+                    v0=vmag, a0=vang,
+                    vmax=bus[:, 11], vmin=bus[:, 12],
+                    area=bus[:, 6], zone=bus[:, 10])
+
+    load = np.flatnonzero((pd != 0) | (qd != 0))
+    system.add_many('PQ', bus=bus_idx[load], name=[f'PQ {item}' for item in bus_idx[load].tolist()],
+                    Vn=base_kv[load], p0=pd[load], q0=qd[load])
+
+    shunt = np.flatnonzero((gs != 0) | (bs != 0))
+    system.add_many('Shunt', bus=bus_idx[shunt], name=[f'Shunt {item}' for item in bus_idx[shunt].tolist()],
+                    Vn=base_kv[shunt], g=gs[shunt], b=bs[shunt])
+
+    # position of bus idx in `bus`
+    sorter = np.argsort(bus_idx)
+
+    def bus_pos(idx):
+        pos = sorter[np.searchsorted(bus_idx, idx, sorter=sorter) % max(len(bus_idx), 1)]
+        unknown = bus_idx[pos] != idx
+        if np.any(unknown):
+            raise KeyError(f'Bus idx {np.unique(idx[unknown]).tolist()} not found')
+        return pos
+
+    # gen
+    # bus  pg  qg  qmax  qmin  vg  mbase  status  pmax  pmin  pc1  pc2
+    #  0   1   2    3     4     5    6      7       8    9    10    11
+    # qc1min  qc1max  qc2min  qc2max  ramp_agc  ramp_10  ramp_30  ramp_q
+    #  12      13       14      15      16        17       18      19
+    # apf
+    #  20
+    gen_bus = gen[:, 0].astype(int)
+    gen_idx = np.arange(1, len(gen) + 1)
+    pos = bus_pos(gen_bus)
+    is_slack = np.isin(gen_bus, bus_idx[bus[:, 1] == 3])
+
+    for model, rows in (('Slack', np.flatnonzero(is_slack)), ('PV', np.flatnonzero(~is_slack))):
+        columns = dict(idx=gen_idx[rows], bus=gen_bus[rows], busr=gen_bus[rows],
+                       name=[f'{model} {item}' for item in gen_bus[rows].tolist()],
+                       u=gen[rows, 7].astype(int),
+                       Vn=base_kv[pos[rows]], v0=gen[rows, 5],
+                       p0=gen[rows, 1] / base_mva, q0=gen[rows, 2] / base_mva,
+                       pmax=gen[rows, 8] / base_mva, pmin=gen[rows, 9] / base_mva,
+                       qmax=gen[rows, 3] / base_mva, qmin=gen[rows, 4] / base_mva)
+        if model == 'Slack':
+            columns['a0'] = vang[pos[rows]]
+        system.add_many(model, columns)
+
+    # branch
+    # fbus	tbus	r	x	b	rateA	rateB	rateC	ratio	angle
+    #  0     1      2   3   4     5       6       7       8      9
+    # status	angmin	angmax	Pf	Qf	Pt	Qt
+    #   10       11       12    13  14  15  16
+    fbus = branch[:, 0]
+    tbus = branch[:, 1]
+
+    # not a transformer if the ratio is zero, or the ratio is one without phase shift
+    trans = ~((branch[:, 8] == 0.0) | ((branch[:, 8] == 1.0) & (branch[:, 9] == 0.0)))
+    ratio = np.where(trans, branch[:, 8], 1)
+    angle = np.where(trans, branch[:, 9] * deg2rad, 0)
+
+    system.add_many('Line', u=branch[:, 10].astype(int),
+                    name=[f'Line {f:.0f}-{t:.0f}' for f, t in zip(fbus.tolist(), tbus.tolist())],
+                    Vn1=base_kv[bus_pos(fbus.astype(int))], Vn2=base_kv[bus_pos(tbus.astype(int))],
+                    bus1=fbus, bus2=tbus,
+                    r=branch[:, 2], x=branch[:, 3], b=branch[:, 4],
+                    trans=trans, tap=ratio, phi=angle)
+
+    if len(mpc.get('bus_name', [])) == len(system.Bus.name.v):
         system.Bus.name.v[:] = mpc['bus_name']
 
-    return ret
+    return True
@@ -4,14 +4,15 @@ PSS/E file parser.
 Include a RAW parser and a DYR parser.
 """
 
+import csv
 import logging
 import re
 import os
 
-from andes.shared import deg2rad, pd, yaml
-from andes.utils.misc import to_number
+from andes.shared import deg2rad, np, pd, yaml
 from andes.utils.develop import warn_experimental
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+from functools import lru_cache
 logger = logging.getLogger(__name__)
 
 
@@ -28,252 +29,349 @@ def testlines(fid):
         return False
 
 
-def get_block_lines(b, mdata):
+# block terminator: a line of `0` with an optional comment
+end_of_block = re.compile(r'^\s*0\s*(/.*)?$')
+rawd = re.compile(r'rawd\d\d')
+
+
+@lru_cache(maxsize=1)
+def _load_raw_schemas():
+    dirname = os.path.dirname(__file__)
+    with open('{}/psse-raw.yaml'.format(dirname), 'r') as f:
+        return yaml.full_load(f)
+
+
+def get_raw_schema(version):
     """
-    Return the number of lines based on data
+    Return the block schemas for the RAW file ``version`` from ``psse-raw.yaml``.
+
+    Versions without a schema are parsed with the nearest version.
     """
-    line_counts = [1, 1, 1, 1, 1, 4, 1, 0, 0, 0, 0, 0, 1, 0, 1, 0, 1, 0, 0]
+    schemas = _load_raw_schemas()
 
-    if b == 5:  # for transformer
-        if mdata[0][2] == 0:  # two-winding transformer
-            return 4
-        else:  # three-winding transformer
-            return 5
+    if version not in schemas:
+        nearest = min(schemas, key=lambda item: abs(item - version))
+        logger.warning(f'RAW file version {version} is not supported. Parsing as version {nearest}.')
+        version = nearest
 
-    return line_counts[b]
+    def resolve(ver):
+        out = resolve(schemas[ver]['inherit']) if 'inherit' in schemas[ver] else dict()
+        out.update({key: val for key, val in schemas[ver].items() if key != 'inherit'})
+        return out
 
+    return resolve(version)
 
-def read(system, file):
-    """read PSS/E RAW file v32 format"""
 
-    blocks = [
-        'bus', 'load', 'fshunt', 'gen', 'branch', 'transf', 'area',
-        'twotermdc', 'vscdc', 'impedcorr', 'mtdc', 'msline', 'zone',
-        'interarea', 'owner', 'facts', 'swshunt', 'gne', 'Q'
-    ]
-    rawd = re.compile(r'rawd\d\d')
+def split_record(line):
+    """
+    Split a RAW record into tokens at commas, keeping quoted strings and dropping the comment after ``/``.
+    """
+    if "'" not in line:
+        return line.split('/', 1)[0].split(',')
 
-    ret = True
-    block_idx = 0  # current block index
-    mva = 100
+    tokens = ['']
+    for i, part in enumerate(line.split("'")):
+        if i % 2 == 1:  # quoted string
+            tokens[-1] += "'" + part + "'"
+            continue
+        part, comment, _ = part.partition('/')
+        fields = part.split(',')
+        tokens[-1] += fields[0]
+        tokens.extend(fields[1:])
+        if comment:
+            break
+    return tokens
 
-    raw = {}
-    for item in blocks:
-        raw[item] = []
 
-    data = []
-    mdata = []  # multi-line data
-    dev_line = 0  # line counter for multi-line models
+def _tokenize(lines, n):
+    """
+    Split the lines of a record into lists of ``n`` tokens, truncated or padded with None.
 
-    # read file into `line_list`
-    with open(file, 'r') as f:
-        line_list = [line.rstrip('\n') for line in f]
-
-    # parse file into `raw` with to_number conversions
-    for num, line in enumerate(line_list):
-        line = line.strip()
-        if num == 0:  # get basemva and frequency
-            data = line.split('/')[0]
-            data = data.split(',')
-
-            mva = float(data[1])
-            system.config.mva = mva
-            system.config.freq = float(data[5])
-
-            # get raw file version
-            version = int(data[2])
-            if not version:
-                version = int(rawd.search(line).group(0).strip('rawd'))
-            logger.debug('PSSE raw version {} detected'.format(version))
-
-            if version < 32 or version > 33:
-                logger.warning('RAW file version is not 32 or 33. Error may occur.')
+    Quoted strings are handled by the ``csv`` module. Comments after ``/`` are dropped.
+    """
+    lines = [(','.join(split_record(line)) if "'" in line else line.split('/', 1)[0]) if '/' in line else line
+             for line in lines]
+    rows = list(csv.reader(lines, quotechar="'", skipinitialspace=True))
+    if len(rows) and min(map(len, rows)) >= n:
+        return rows
+    return [row[:n] + [None] * (n - len(row)) for row in rows]
+
+
+def _to_columns(lines, records):
+    """
+    Convert the lines of the records of a block into typed columns.
+
+    Omitted or empty fields take the defaults in ``records``, whose types set the column types.
+    """
+    fields, cols = [], []
+    for record, item in zip(records, lines):
+        rows = _tokenize(item, len(record))
+        fields.extend(record.items())
+        cols.extend(list(zip(*rows))[:len(record)] if len(rows) else [()] * len(record))
+
+    out = OrderedDict()
+    for (name, default), col in zip(fields, cols):
+        if isinstance(default, str):
+            out[name] = [default if (item is None or not item.strip()) else item.strip() for item in col]
             continue
+        try:
+            values = np.array(col, dtype=float)
+        except (TypeError, ValueError):
+            values = np.array([str(default) if (item is None or not item.strip()) else item for item in col],
+                              dtype=float)
+        out[name] = values.astype(int) if isinstance(default, int) else values
+    return out
+
 
-        elif num == 1 or num == 2:  # store the case info line
+def _bus_get(system, src, idx):
+    """
+    Return the values of the Bus parameter ``src`` for the buses ``idx`` in an array.
+    """
+    return np.asarray(system.Bus.__dict__[src].v)[system.Bus.idx2uid(np.asarray(idx).tolist())]
+
+
+def read(system, file):
+    """
+    Read a PSS/E RAW file in a single pass.
+
+    The lines of each block are collected and tokenized into typed columns with the schemas of the
+    RAW version (see ``psse-raw.yaml``). Each block is added to the system in bulk as soon as it ends.
+    """
+    with open(file, 'r') as f:
+        # get basemva and frequency
+        line = f.readline()
+        data = line.split('/')[0].split(',')
+
+        mva = float(data[1])
+        system.config.mva = mva
+        system.config.freq = float(data[5])
+
+        # get raw file version
+        version = int(data[2])
+        if not version:
+            version = int(rawd.search(line).group(0).strip('rawd'))
+        logger.debug('PSSE raw version {} detected'.format(version))
+        schema = get_raw_schema(version)
+
+        # store the case info lines
+        for _ in range(2):
+            line = f.readline().strip()
             if len(line) > 0:
                 logger.info(line)
-            continue
-        elif num >= 3:
-            if line[0:2] == '0 ' or line[0:3] == ' 0 ':  # end of block
-                block_idx += 1
+
+        blocks = iter(schema['blocks'])
+        block = next(blocks, None)
+        ctx = {'mva': mva, 'sw': {}, 'max_bus': 0}
+        lines, pos = OrderedDict(), defaultdict(list)  # lines of each record, and device positions
+        device, key, n_dev = [], None, 0  # lines of the current device
+
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('@!'):  # skip blank and field header lines
                 continue
-            elif line[0] == 'Q':  # end of file
-                break
-            data = line.split(',')
-
-        data = [to_number(item) for item in data]
-        mdata.append(data)
-        dev_line += 1
-
-        block_lines = get_block_lines(block_idx, mdata)
-        if dev_line >= block_lines:
-            if block_lines == 1:
-                mdata = mdata[0]
-            raw[blocks[block_idx]].append(mdata)
-            mdata = []
-            dev_line = 0
-
-    # add device elements to system
-    sw = {}  # idx:a0
-    max_bus = []
-    for data in raw['bus']:
-        # version 32:
-        #   0,   1,      2,     3,    4,   5,  6,   7,  8
-        #   ID, NAME, BasekV, Type, Area Zone Owner Vm, Va
-        #
-        idx = data[0]
-        max_bus.append(idx)
-        ty = data[3]
-        a0 = data[8] * deg2rad
-
-        if ty == 3:
-            sw[idx] = a0
-        param = {'idx': idx, 'name': data[1], 'Vn': data[2],
-                 'v0': data[7], 'a0': a0,
-                 'area': data[4], 'zone': data[5], 'owner': data[6]}
-        system.add('Bus', param)
-
-    max_bus = max(max_bus)
-    for data in raw['load']:
-        # version 32:
-        #  0,  1,      2,    3,    4,    5,    6,      7,   8,  9, 10,   11
-        # Bus, Id, Status, Area, Zone, PL(MW), QL (MW), IP, IQ, YP, YQ, OWNER
-        #
-        bus = data[0]
-        vn = system.Bus.get(src='Vn', idx=bus, attr='v')
-        v0 = system.Bus.get(src='v0', idx=bus, attr='v')
-        param = {'bus': bus, 'u': data[2], 'Vn': vn,
-                 'p0': (data[5] + data[7] * v0 + data[9] * v0 ** 2) / mva,
-                 'q0': (data[6] + data[8] * v0 - data[10] * v0 ** 2) / mva,
-                 'owner': data[11]}
-        system.add('PQ', param)
-
-    for data in raw['fshunt']:
-        # 0,    1,      2,      3,      4
-        # Bus, name, Status, g (MW), b (Mvar)
-        bus = data[0]
-        vn = system.Bus.get(src='Vn', idx=bus, attr='v')
-
-        param = {'bus': bus, 'Vn': vn, 'u': data[2],
-                 'Sn': mva, 'g': data[3] / mva, 'b': data[4] / mva}
-        system.add('Shunt', param)
-
-    gen_idx = 0
-    for data in raw['gen']:
-        #  0, 1, 2, 3, 4, 5, 6, 7,    8,   9,10,11, 12, 13, 14,   15, 16,17,18,19
-        #  I,ID,PG,QG,QT,QB,VS,IREG,MBASE,ZR,ZX,RT,XT,GTAP,STAT,RMPCT,PT,PB,O1,F1
-        bus = data[0]
-        vn = system.Bus.get(src='Vn', idx=bus, attr='v')
-        gen_mva = data[8]  # unused yet
-        gen_idx += 1
-        status = data[14]
-        param = {'Sn': gen_mva, 'Vn': vn, 'u': status, 'idx': gen_idx, 'bus': bus,
-                 'p0': status * data[2] / mva,
-                 'q0': status * data[3] / mva,
-                 'pmax': data[16] / mva, 'pmin': data[17] / mva,
-                 'qmax': data[4] / mva, 'qmin': data[5] / mva,
-                 'v0': data[6],
-                 'ra': data[9],  # ra  armature resistance
-                 'xs': data[10],  # xs synchronous reactance
-                 }
-        if data[0] in sw.keys():
-            param.update({'a0': sw[data[0]]})
-            system.add('Slack', param)
-        else:
-            system.add('PV', param)
-
-    for data in raw['branch']:
-        #
-        # I,J,CKT,R,X,B,RATEA,RATEB,RATEC,GI,BI,GJ,BJ,ST,LEN,O1,F1,...,O4,F4
-        #
-        param = {
-            'bus1': data[0], 'bus2': data[1],
-            'r': data[3], 'x': data[4], 'b': data[5],
-            'Vn1': system.Bus.get(src='Vn', idx=data[0], attr='v'),
-            'Vn2': system.Bus.get(src='Vn', idx=data[1], attr='v'),
-        }
-        system.add('Line', **param)
-
-    xf_3_count = 1
-    for data in raw['transf']:
-        if len(data) == 4:
-            # """
-            # I,J,K,CKT,CW,CZ,CM,MAG1,MAG2,NMETR,'NAME',STAT,O1,F1,...,O4,F4
-            # R1-2,X1-2,SBASE1-2
-            # WINDV1,NOMV1,ANG1,RATA1,RATB1,RATC1,COD1,CONT1,RMA1,RMI1,VMA1,VMI1,NTP1,TAB1,CR1,CX1
-            # WINDV2,NOMV2
-            # """
-
-            tap = data[2][0]
-            phi = data[2][2]
-
-            if tap == 1 and phi == 0:
-                transf = False
-            else:
-                transf = True
-            param = {'bus1': data[0][0], 'bus2': data[0][1], 'u': data[0][11],
-                     'b': data[0][8], 'r': data[1][0], 'x': data[1][1],
-                     'trans': transf, 'tap': tap, 'phi': phi,
-                     'Vn1': system.Bus.get(src='Vn', idx=data[0][0], attr='v'),
-                     'Vn2': system.Bus.get(src='Vn', idx=data[0][1], attr='v'),
-                     }
-            system.add('Line', param)
+            elif (line[0] == '0' and end_of_block.match(line)) or line[0] == 'Q':
+                _add_block(system, block, schema, lines, pos, ctx)
+                lines, pos = OrderedDict(), defaultdict(list)
+                device, n_dev = [], 0
+                if line[0] == 'Q':  # end of file
+                    break
+                block = next(blocks, None)
+                continue
+            elif block not in raw_handlers:
+                continue
+
+            if len(device) == 0:
+                key = block
+                if block == 'transf':
+                    fields = split_record(line)
+                    if len(fields) < 3:
+                        logger.error(f'Transformer record <{line}> has fewer than three fields.')
+                        return False
+                    key = 'transf3' if int(float(fields[2] or 0)) != 0 else 'transf2'
+            device.append(line)
+
+            if len(device) == len(schema[key]):
+                if key not in lines:
+                    lines[key] = [[] for _ in schema[key]]
+                for record, item in zip(lines[key], device):
+                    record.append(item)
+                pos[key].append(n_dev)
+                n_dev += 1
+                device = []
         else:
-            # I, J, K, CKT, CW, CZ, CM, MAG1, MAG2, NMETR, 'NAME', STAT, Ol, Fl,...,o4, F4
-            # R1-2, X1-2, SBASE1-2, R2-3, X2-3, SBASE2-3, R3-1, X3-1, SBASE3-1, VMSTAR, ANSTAR
-            # WINDV1, NOMV1, ANG1, RATA1, BATB1, RATC1, COD1, CONT1, RMA1, RMI1, VMA1, VMI1, NTP1, TAB1, CR1, CX1
-            # WINDV2, NOMV2, ANG2, RATA2, BATB2, RATC2, COD2, CONT2, RMA2, RMI2, VMA2, VMI2, NTP2, TAB2, CR2, CX2
-            # WINDV3, NOMV3, ANG3, RATA3, BATB3, RATC3, COD3, CONT3, RMA3, RMI3, VMA3, VMI3, NTP3, TAB3, CR3, CX3
-            param = {'idx': max_bus + xf_3_count, 'name': '_'.join(str(data[0][:3])),
-                     'Vn': system.Bus.get(src='Vn', idx=data[0][0], attr='v'),
-                     'v0': data[1][-2], 'a0': data[1][-1] * deg2rad
-                     }
-            system.add('Bus', param)
-
-            r = []
-            x = []
-            r.append((data[1][0] + data[1][6] - data[1][3])/2)
-            r.append((data[1][3] + data[1][0] - data[1][6])/2)
-            r.append((data[1][6] + data[1][3] - data[1][0])/2)
-            x.append((data[1][1] + data[1][7] - data[1][4])/2)
-            x.append((data[1][4] + data[1][1] - data[1][7])/2)
-            x.append((data[1][7] + data[1][4] - data[1][1])/2)
-            for i in range(0, 3):
-                param = {'trans': True, 'bus1': data[0][i], 'bus2': max_bus+xf_3_count, 'u': data[0][11],
-                         'b': data[0][8], 'r': r[i], 'x': x[i],
-                         'tap': data[2+i][0], 'phi': data[2+i][2],
-                         'Vn1': system.Bus.get(src='Vn', idx=data[0][i], attr='v'),
-                         'Vn2': system.Bus.get(src='Vn', idx=data[0][0], attr='v'),
-                         }
-                system.add('Line', param)
-            xf_3_count += 1
-
-    for data in raw['swshunt']:
-        # I, MODSW, ADJM, STAT, VSWHI, VSWLO, SWREM, RMPCT, RMIDNT,
-        # BINIT, N1, B1, N2, B2, ... N8, B8
-        bus = data[0]
-        vn = system.Bus.get(src='Vn', idx=bus, attr='v')
-        param = {'bus': bus, 'Vn': vn, 'Sn': mva, 'u': data[3],
-                 'b': data[9] / mva}
-        system.add('Shunt', param)
-
-    for data in raw['area']:
-        # ID, ISW, PDES, PTOL, ARNAME
-        param = {'idx': data[0], 'name': data[4],
-                 # 'isw': data[1],
-                 # 'pdes': data[2],
-                 # 'ptol': data[3],
-                 }
-        system.add('Area', param)
-
-    for data in raw['zone']:
-        # """ID, NAME"""
-        param = {'idx': data[0], 'name': data[1]}
-        # TODO: add back
-        # system.add('Region', param)
-
-    return ret
+            _add_block(system, block, schema, lines, pos, ctx)
+
+    return True
+
+
+def _add_block(system, block, schema, lines, pos, ctx):
+    """
+    Convert the lines of a block into columns and add the devices with the block handler.
+    """
+    if block not in raw_handlers or len(lines) == 0:
+        return
+    data = OrderedDict()
+    for key, val in lines.items():
+        data[key] = _to_columns(val, schema[key])
+        data[key]['_pos'] = np.array(pos[key], dtype=int)
+    raw_handlers[block](system, data, ctx)
+
+
+def _add_bus(system, data, ctx):
+    # version 32:
+    #   0,   1,      2,     3,    4,   5,  6,   7,  8
+    #   ID, NAME, BasekV, Type, Area Zone Owner Vm, Va
+    #
+    c = data['bus']
+    a0 = c['VA'] * deg2rad
+    system.add_many('Bus', idx=c['I'], name=c['NAME'], Vn=c['BASKV'],
+                    v0=c['VM'], a0=a0,
+                    area=c['AREA'], zone=c['ZONE'], owner=c['OWNER'])
+
+    slack = c['IDE'] == 3
+    ctx['sw'].update(zip(c['I'][slack].tolist(), a0[slack].tolist()))
+    ctx['max_bus'] = max(ctx['max_bus'], int(np.max(c['I'])))
+
+
+def _add_load(system, data, ctx):
+    # version 32:
+    #  0,  1,      2,    3,    4,    5,    6,      7,   8,  9, 10,   11
+    # Bus, Id, Status, Area, Zone, PL(MW), QL (MW), IP, IQ, YP, YQ, OWNER
+    #
+    c = data['load']
+    mva = ctx['mva']
+    v0 = _bus_get(system, 'v0', c['I'])
+    system.add_many('PQ', bus=c['I'], u=c['STATUS'], Vn=_bus_get(system, 'Vn', c['I']),
+                    p0=(c['PL'] + c['IP'] * v0 + c['YP'] * v0 ** 2) / mva,
+                    q0=(c['QL'] + c['IQ'] * v0 - c['YQ'] * v0 ** 2) / mva,
+                    owner=c['OWNER'])
+
+
+def _add_fshunt(system, data, ctx):
+    # 0,    1,      2,      3,      4
+    # Bus, name, Status, g (MW), b (Mvar)
+    c = data['fshunt']
+    mva = ctx['mva']
+    system.add_many('Shunt', bus=c['I'], Vn=_bus_get(system, 'Vn', c['I']), u=c['STATUS'],
+                    Sn=np.full(len(c['I']), mva), g=c['GL'] / mva, b=c['BL'] / mva)
+
+
+def _add_gen(system, data, ctx):
+    #  0, 1, 2, 3, 4, 5, 6, 7,    8,   9,10,11, 12, 13, 14,   15, 16,17,18,19
+    #  I,ID,PG,QG,QT,QB,VS,IREG,MBASE,ZR,ZX,RT,XT,GTAP,STAT,RMPCT,PT,PB,O1,F1
+    c = data['gen']
+    mva = ctx['mva']
+    status = c['STAT']
+    columns = OrderedDict(Sn=c['MBASE'], Vn=_bus_get(system, 'Vn', c['I']), u=status,
+                          idx=np.arange(1, len(status) + 1), bus=c['I'],
+                          p0=status * c['PG'] / mva, q0=status * c['QG'] / mva,
+                          pmax=c['PT'] / mva, pmin=c['PB'] / mva,
+                          qmax=c['QT'] / mva, qmin=c['QB'] / mva,
+                          v0=c['VS'],
+                          ra=c['ZR'],  # ra  armature resistance
+                          xs=c['ZX'],  # xs synchronous reactance
+                          )
+
+    slack = np.isin(c['I'], list(ctx['sw'].keys()))
+    for model, rows in (('Slack', np.flatnonzero(slack)), ('PV', np.flatnonzero(~slack))):
+        param = OrderedDict((name, val[rows]) for name, val in columns.items())
+        if model == 'Slack':
+            param['a0'] = [ctx['sw'][item] for item in param['bus'].tolist()]
+        system.add_many(model, param)
+
+
+def _add_branch(system, data, ctx):
+    #
+    # I,J,CKT,R,X,B,RATEA,RATEB,RATEC,GI,BI,GJ,BJ,ST,LEN,O1,F1,...,O4,F4
+    #
+    c = data['branch']
+    system.add_many('Line', bus1=c['I'], bus2=c['J'],
+                    r=c['R'], x=c['X'], b=c['B'],
+                    Vn1=_bus_get(system, 'Vn', c['I']),
+                    Vn2=_bus_get(system, 'Vn', c['J']))
+
+
+def _add_transf(system, data, ctx):
+    # Two-winding transformers are added as one line, and three-winding transformers as three lines
+    # connected to a new star bus. Lines are added in the file order of transformers.
+    lines, keys = [], []
+
+    if 'transf2' in data:
+        # I,J,K,CKT,CW,CZ,CM,MAG1,MAG2,NMETR,'NAME',STAT,O1,F1,...,O4,F4
+        # R1-2,X1-2,SBASE1-2
+        # WINDV1,NOMV1,ANG1,RATA1,RATB1,RATC1,COD1,CONT1,RMA1,RMI1,VMA1,VMI1,NTP1,TAB1,CR1,CX1
+        # WINDV2,NOMV2
+        c = data['transf2']
+        trans = ~((c['WINDV1'] == 1) & (c['ANG1'] == 0))
+        # ANG1 is in degrees and `Line.phi` in radians
+        lines.append(OrderedDict(bus1=c['I'], bus2=c['J'], u=c['STAT'],
+                                 b=c['MAG2'], r=c['R1-2'], x=c['X1-2'],
+                                 trans=trans, tap=c['WINDV1'], phi=c['ANG1'] * deg2rad,
+                                 Vn1=_bus_get(system, 'Vn', c['I']),
+                                 Vn2=_bus_get(system, 'Vn', c['J'])))
+        keys.append(c['_pos'] * 3)
+
+    if 'transf3' in data:
+        # I, J, K, CKT, CW, CZ, CM, MAG1, MAG2, NMETR, 'NAME', STAT, Ol, Fl,...,o4, F4
+        # R1-2, X1-2, SBASE1-2, R2-3, X2-3, SBASE2-3, R3-1, X3-1, SBASE3-1, VMSTAR, ANSTAR
+        # WINDV1, NOMV1, ANG1, RATA1, BATB1, RATC1, COD1, CONT1, RMA1, RMI1, VMA1, VMI1, NTP1, TAB1, CR1, CX1
+        # WINDV2, NOMV2, ANG2, RATA2, BATB2, RATC2, COD2, CONT2, RMA2, RMI2, VMA2, VMI2, NTP2, TAB2, CR2, CX2
+        # WINDV3, NOMV3, ANG3, RATA3, BATB3, RATC3, COD3, CONT3, RMA3, RMI3, VMA3, VMI3, NTP3, TAB3, CR3, CX3
+        c = data['transf3']
+        n = len(c['I'])
+        star = ctx['max_bus'] + np.arange(1, n + 1)
+        vn = _bus_get(system, 'Vn', c['I'])
+        names = [f'{i}_{j}_{k}' for i, j, k in zip(c['I'].tolist(), c['J'].tolist(), c['K'].tolist())]
+        system.add_many('Bus', idx=star, name=names, Vn=vn, v0=c['VMSTAR'], a0=c['ANSTAR'] * deg2rad)
+        ctx['max_bus'] += n
+
+        # star-equivalent impedances
+        r = [(c['R1-2'] + c['R3-1'] - c['R2-3']) / 2,
+             (c['R2-3'] + c['R1-2'] - c['R3-1']) / 2,
+             (c['R3-1'] + c['R2-3'] - c['R1-2']) / 2]
+        x = [(c['X1-2'] + c['X3-1'] - c['X2-3']) / 2,
+             (c['X2-3'] + c['X1-2'] - c['X3-1']) / 2,
+             (c['X3-1'] + c['X2-3'] - c['X1-2']) / 2]
+        for i, (bus, winding) in enumerate(zip(('I', 'J', 'K'), ('1', '2', '3'))):
+            lines.append(OrderedDict(bus1=c[bus], bus2=star, u=c['STAT'],
+                                     b=c['MAG2'], r=r[i], x=x[i],
+                                     trans=np.ones(n, dtype=bool),
+                                     tap=c['WINDV' + winding], phi=c['ANG' + winding] * deg2rad,
+                                     Vn1=_bus_get(system, 'Vn', c[bus]),
+                                     Vn2=vn))
+            keys.append(c['_pos'] * 3 + i)
+
+    order = np.argsort(np.concatenate(keys), kind='stable')
+    system.add_many('Line', OrderedDict((name, np.concatenate([item[name] for item in lines])[order])
+                                        for name in lines[0]))
+
+
+def _add_swshunt(system, data, ctx):
+    # I, MODSW, ADJM, STAT, VSWHI, VSWLO, SWREM, RMPCT, RMIDNT,
+    # BINIT, N1, B1, N2, B2, ... N8, B8
+    c = data['swshunt']
+    mva = ctx['mva']
+    system.add_many('Shunt', bus=c['I'], Vn=_bus_get(system, 'Vn', c['I']),
+                    Sn=np.full(len(c['I']), mva), u=c['STAT'], b=c['BINIT'] / mva)
+
+
+def _add_area(system, data, ctx):
+    # ID, ISW, PDES, PTOL, ARNAME
+    c = data['area']
+    system.add_many('Area', idx=c['I'], name=c['ARNAME'])
+
+
+# handlers to add the devices of each block
+raw_handlers = {
+    'bus': _add_bus,
+    'load': _add_load,
+    'fshunt': _add_fshunt,
+    'gen': _add_gen,
+    'branch': _add_branch,
+    'transf': _add_transf,
+    'area': _add_area,
+    'swshunt': _add_swshunt,
+}
 
 
 def read_add(system, file):
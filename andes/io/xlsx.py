@@ -50,6 +50,9 @@ def write(system, outfile, skip_empty=True, overwrite=None, add_sheet=None):
 
     writer = pd.ExcelWriter(outfile, engine='xlsxwriter')
 
+    if not skip_empty:
+        system.import_models()
+
     for name, instance in system.models.items():
         if skip_empty and instance.n == 0:
             continue
@@ -62,8 +65,8 @@ def write(system, outfile, skip_empty=True, overwrite=None, add_sheet=None):
             add_sheet = [add_sheet]
 
         for item in add_sheet:
-            if item in system.models:
-                system.models[item].cache.df_in.to_excel(writer, sheet_name=item, freeze_panes=(1, 0))
+            if item in system._model_files:
+                system.import_model(item).cache.df_in.to_excel(writer, sheet_name=item, freeze_panes=(1, 0))
                 logger.info(f'<{item}> template sheet added.')
             else:
                 logger.error(f'<{item}> is not a valid model name.')
@@ -77,6 +80,8 @@ def read(system, infile):
     """
     Read an xlsx file with ANDES model data into an empty system
 
+    Each sheet is added in bulk with ``System.add_many`` from its columns.
+
     Parameters
     ----------
     system : System
@@ -95,7 +100,6 @@ def read(system, infile):
         df_models = pd.read_excel(infile, sheet_name=None, index_col=0)
 
     for name, df in df_models.items():
-        for row in df.to_dict(orient='record'):
-            system.add(name, row)
+        system.add_many(name, df)
 
     return system
@@ -6,18 +6,17 @@ import io
 import sys
 import platform
 import pprint
+import re
 import cProfile
 import pstats
 from subprocess import call
-from time import sleep
+from time import perf_counter
 from typing import Optional, Union
 
 import andes
-from andes.system import System
 from andes.utils.misc import elapsed, is_interactive
 from andes.utils.paths import get_config_path
 from andes.utils.paths import tests_root
-from andes.shared import coloredlogs, Process, unittest
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -89,6 +88,7 @@ def config_logger(logger=None,
         globals()['logger'] = logger
 
     if (not is_interactive()) and color:
+        import coloredlogs  # NOQA
         coloredlogs.install(logger=logger, level=stream_level, fmt='%(message)s')
 
 
@@ -167,7 +167,7 @@ def save_conf(config_path=None):
     if config_path is not None and os.path.isdir(config_path):
         config_path = os.path.join(config_path, 'andes.rc')
 
-    ps = System()
+    ps = andes.System()
     ps.save_config(config_path)
     ret = True
 
@@ -177,8 +177,8 @@ def save_conf(config_path=None):
 def remove_output():
     """
     Remove the outputs generated by Andes, including power flow reports
-    ``_out.txt``, time-domain list ``_out.lst`` and data ``_out.dat``,
-    eigenvalue analysis report ``_eig.txt``.
+    ``_out.txt``, time-domain list ``_out.lst`` and data ``_out.npy``,
+    streamed segments ``_out.NNNN.npy``, eigenvalue analysis report ``_eig.txt``.
 
     Returns
     -------
@@ -194,9 +194,13 @@ def remove_output():
                 file.endswith('_out.txt') or \
                 file.endswith('_out.lst') or \
                 file.endswith('_out.npy') or \
+                file.endswith('_out.npz') or \
                 file.endswith('_out.csv') or \
+                file.endswith('_out.parquet') or \
+                file.endswith('_out.feather') or \
                 file.endswith('_prof.prof') or \
-                file.endswith('_prof.txt'):
+                file.endswith('_prof.txt') or \
+                re.search(r'_out\.\d{4}\.npy$', file):
             found = True
             try:
                 os.remove(file)
@@ -217,7 +221,7 @@ def print_license():
 
 def load(case, **kwargs):
     """Load a case and set up without running. Return a system"""
-    system = System(case=case, options=kwargs)
+    system = andes.System(case=case, options=kwargs)
     system.undill_calls()
 
     if not andes.io.parse(system):
@@ -227,9 +231,12 @@ def load(case, **kwargs):
     return system
 
 
-def run_case(case, routine=None, profile=False, convert='', convert_all='', add_sheet=None, **kwargs):
+def run_case(case, routine=None, profile=False, convert='', convert_all='', add_sheet=None, export=None,
+             **kwargs):
     """
     Run a single simulation case.
+
+    If ``export`` is ``parquet`` or ``feather``, the TDS results are also exported to the format.
     """
     pr = cProfile.Profile()
     # enable profiler if requested
@@ -258,6 +265,9 @@ def run_case(case, routine=None, profile=False, convert='', convert_all='', add_
         routine = routine.lower()
         if routine == 'tds':
             system.TDS.run()
+            if export:
+                system.TDS.load_plotter()
+                system.TDS.plotter.export(export)
         elif routine == 'eig':
             system.EIG.run()
 
@@ -284,7 +294,97 @@ def run_case(case, routine=None, profile=False, convert='', convert_all='', add_
     return system
 
 
-def run(filename, input_path='', ncpu=1, verbose=20, **kwargs):
+class CaseResult(object):
+    """
+    Summary of a case run in a worker process.
+
+    Attributes
+    ----------
+    case : str
+        Path to the case file
+    status : str
+        ``ok`` if the case finished, or ``failed`` if an exception was raised
+    elapsed : float
+        Wall time in seconds
+    error : str or None
+        Error message if failed
+    metrics : dict
+        Summary metrics, such as the power flow convergence and the final TDS time
+    """
+
+    def __init__(self, case, status='ok', elapsed=0.0, error=None, metrics=None):
+        self.case = case
+        self.status = status
+        self.elapsed = elapsed
+        self.error = error
+        self.metrics = {} if metrics is None else metrics
+
+    def __repr__(self):
+        return f'CaseResult(case={os.path.basename(self.case)!r}, status={self.status!r}, ' \
+               f'elapsed={self.elapsed:.4g}, metrics={self.metrics})'
+
+
+def _case_metrics(system):
+    """
+    Collect summary metrics of a system after simulation.
+    """
+    metrics = dict()
+    if system is None:
+        return metrics
+    metrics['n_bus'] = system.Bus.n
+    metrics['pflow_converged'] = bool(system.PFlow.converged)
+    metrics['pflow_niter'] = system.PFlow.niter
+    if system.TDS.initialized or system.dae.t > 0:
+        metrics['tds_initialized'] = bool(system.TDS.initialized)
+        metrics['tds_t'] = float(system.dae.t)
+        metrics['tds_busted'] = bool(system.TDS.busted)
+    return metrics
+
+
+def _init_worker():
+    """
+    Keep only warnings and errors from the loggers in a worker process.
+    """
+    logging.getLogger('andes').setLevel(logging.WARNING)
+
+
+def _run_case_worker(case, kwargs):
+    """
+    Run a case in a worker process and return a ``CaseResult`` instead of the ``System``.
+    """
+    t0 = perf_counter()
+    try:
+        system = run_case(case, **kwargs)
+    except Exception as e:
+        return CaseResult(case, status='failed', elapsed=perf_counter() - t0, error=repr(e))
+    return CaseResult(case, elapsed=perf_counter() - t0, metrics=_case_metrics(system))
+
+
+def run(filename, input_path='', ncpu=1, verbose=20, longest_first=False, **kwargs):
+    """
+    Run the routines for one or multiple cases.
+
+    Multiple cases are dispatched to a pool of `ncpu` worker processes, and each worker takes the next case as
+    soon as it finishes one.
+
+    Parameters
+    ----------
+    filename : str or list
+        Case file names or glob patterns
+    input_path : str
+        Path to prepend to the case file names
+    ncpu : int
+        Number of worker processes for multiple cases
+    verbose : int
+        Logging level
+    longest_first : bool
+        Start the cases with the largest files first, which shortens the total time when case sizes differ
+
+    Returns
+    -------
+    System or list
+        The ``System`` for a single case, or a list of ``CaseResult`` in the order of the cases for multiple cases
+    """
     if is_interactive():
         config_logger(file=False, stream_level=verbose)
 
@@ -304,8 +404,8 @@ def run(filename, input_path='', ncpu=1, verbose=20, **kwargs):
         else:
             cases += found
 
-    # remove folders and make cases unique
-    unique_cases = list(set(cases))
+    # remove folders and make cases unique in the given order
+    unique_cases = list(dict.fromkeys(cases))
     valid_cases = []
     for case in unique_cases:
         if os.path.isfile(case):
@@ -319,28 +419,7 @@ def run(filename, input_path='', ncpu=1, verbose=20, **kwargs):
     elif len(valid_cases) == 1:
         system = run_case(valid_cases[0], **kwargs)
     else:
-        logger.info('Processing {} jobs on {} CPUs'.format(len(valid_cases), ncpu))
-        logger.handlers[0].setLevel(logging.WARNING)
-
-        # start processes
-        jobs = []
-        for idx, file in enumerate(valid_cases):
-            job = Process(name='Process {0:d}'.format(idx), target=run_case, args=(file, ), kwargs=kwargs)
-            jobs.append(job)
-            job.start()
-
-            start_msg = 'Process {:d} <{:s}> started.'.format(idx, file)
-            print(start_msg)
-            logger.debug(start_msg)
-
-            if (idx % ncpu == ncpu - 1) or (idx == len(valid_cases) - 1):
-                sleep(0.1)
-                for job in jobs:
-                    job.join()
-                jobs = []
-
-        # restore command line output when all jobs are done
-        logger.handlers[0].setLevel(logging.INFO)
+        system = _run_pool(valid_cases, ncpu=ncpu, longest_first=longest_first, **kwargs)
 
     t0, s0 = elapsed(t0)
 
@@ -352,6 +431,43 @@ def run(filename, input_path='', ncpu=1, verbose=20, **kwargs):
     return system
 
 
+def _run_pool(cases, ncpu=1, longest_first=False, **kwargs):
+    """
+    Run multiple cases with a pool of worker processes and return a list of ``CaseResult``.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed  # NOQA
+
+    ncpu = max(min(ncpu, len(cases)), 1)
+    order = list(range(len(cases)))
+    if longest_first:
+        order.sort(key=lambda i: os.path.getsize(cases[i]), reverse=True)
+
+    logger.info('Processing {} jobs on {} CPUs'.format(len(cases), ncpu))
+
+    results = [None] * len(cases)
+    with ProcessPoolExecutor(max_workers=ncpu, initializer=_init_worker) as executor:
+        futures = dict()
+        for i in order:
+            futures[executor.submit(_run_case_worker, cases[i], kwargs)] = i
+            logger.debug(f'Job {i} <{cases[i]}> submitted.')
+
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                # the worker process terminated abruptly
+                results[i] = CaseResult(cases[i], status='failed', error=repr(e))
+            logger.info(f'Job {i} <{os.path.basename(cases[i])}> {results[i].status} '
+                        f'in {results[i].elapsed:.4f} second.')
+
+    failed = [item for item in results if item.status != 'ok']
+    for item in failed:
+        logger.error(f'Case <{item.case}> failed: {item.error}')
+    logger.info(f'{len(results) - len(failed)} of {len(results)} cases completed.')
+    return results
+
+
 def plot(**kwargs):
     from andes.plot import tdsplot
     tdsplot(**kwargs)
@@ -376,7 +492,7 @@ def misc(edit_config='', save_config='', show_license=False, clean=True, **kwarg
 def prepare(quick=False, **kwargs):
     t0, _ = elapsed()
     logger.info('Numeric code preparation started...')
-    system = System()
+    system = andes.System()
     system.prepare(quick=quick)
     _, s = elapsed(t0)
     logger.info(f'Successfully generated numerical code in {s}.')
@@ -384,6 +500,7 @@ def prepare(quick=False, **kwargs):
 
 
 def selftest(**kwargs):
+    import unittest  # NOQA
     logger.handlers[0].setLevel(logging.WARNING)
     test_directory = tests_root()
 
@@ -391,15 +508,25 @@ def selftest(**kwargs):
     unittest.TextTestRunner(verbosity=3).run(suite)
 
 
+def bench(case=None, repeat=3, output=None, budget=None, **kwargs):
+    from andes.bench import bench as run_bench
+    return run_bench(case if case else None, repeat=repeat, output=output, budget=budget)
+
+
 def doc(model=None, list_models=False, **kwargs):
-    system = System()
+    system = andes.System()
     if model is not None:
-        if model in system.__dict__ and hasattr(system.__dict__[model], 'doc'):
-            logger.info(system.__dict__[model].doc())
+        if model in system._model_files:
+            instance = system.import_model(model)
+        else:
+            instance = system.__dict__.get(model)
+        if instance is not None and hasattr(instance, 'doc'):
+            logger.info(instance.doc())
         else:
             logger.error(f'Model <{model}> does not exist.')
 
     elif list_models is True:
+        system.import_models()
         m_names = list()
         for g in system.groups:
             for m in system.groups[g].models:
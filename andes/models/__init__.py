@@ -1,4 +1,3 @@
-from .jit import JIT  # NOQA
 from collections import OrderedDict  # NOQA
 
 
@@ -1,5 +1,7 @@
 import logging
+import math
 from andes.shared import np
+from andes.utils.func import sorted_index, index_lookup
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +18,12 @@ class GroupBase(object):
         self.models = {}  # model name, model instance
         self._idx2model = {}  # element idx, model name
 
+        self._index = None  # sorted index of the idx of all models for `idx2mid_uid`
+        self._index_n = -1  # number of elements when `_index` was built
+        self._index_models = []  # models with elements when `_index` was built
+        self._index_mid = None  # model position in `_index_models` of each indexed idx
+        self._index_uid = None  # uid of each indexed idx
+
     @property
     def class_name(self):
         return self.__class__.__name__
@@ -47,6 +55,22 @@ class GroupBase(object):
                            f'<{self._idx2model[idx].class_name}>')
         self._idx2model[idx] = model
 
+    def add_batch(self, idx, model):
+        """
+        Register a list of idx from a model to the group
+
+        Parameters
+        ----------
+        idx : list
+            idx of the new elements, which must be unique
+        model : Model
+            instance of the model
+        """
+        conflict = set(idx).intersection(self._idx2model)
+        if len(conflict) > 0:
+            raise KeyError(f'Group <{self.class_name}> already contains {sorted(map(repr, conflict))}')
+        self._idx2model.update(dict.fromkeys(idx, model))
+
     def idx2model(self, idx):
         ret = []
         for i in idx:
@@ -56,6 +80,39 @@ class GroupBase(object):
                 raise KeyError(f'Group <{self.class_name}> does not contain idx <{i}>')
         return ret
 
+    def idx2mid_uid(self, idx):
+        """
+        Convert a list of idx to the positions of the models in ``self._index_models`` and the uids.
+
+        Unlike ``Model.idx2uid``, which returns the uids only, the result identifies the model of each idx.
+
+        Returns
+        -------
+        tuple
+            ``(mid, uid)`` as arrays of int
+        """
+        if self._index_n != len(self._idx2model):
+            self._index_models = [mdl for mdl in self.models.values() if mdl.n > 0]
+            keys = [item for mdl in self._index_models for item in mdl.idx]
+            self._index = sorted_index(keys)
+            self._index_mid = np.repeat(np.arange(len(self._index_models)),
+                                        [mdl.n for mdl in self._index_models]).astype(int)
+            self._index_uid = np.concatenate([np.arange(mdl.n) for mdl in self._index_models] +
+                                             [np.zeros(0, dtype=int)]).astype(int)
+            self._index_n = len(self._idx2model)
+
+        pos = index_lookup(self._index, idx) if self._index is not None else None
+        if pos is None:
+            mids = {id(mdl): i for i, mdl in enumerate(self._index_models)}
+            models = self.idx2model(idx)
+            mid = np.array([mids[id(mdl)] for mdl in models], dtype=int)
+            uid = np.array([mdl.uid[item] for mdl, item in zip(models, idx)], dtype=int)
+            return mid, uid
+
+        if np.any(pos < 0):
+            raise KeyError(f'Group <{self.class_name}> does not contain idx <{idx[int(np.argmax(pos < 0))]}>')
+        return self._index_mid[pos], self._index_uid[pos]
+
     def get(self, src: str, idx, attr: str = 'v'):
         """
         Based on the indexer, get the `attr` field of the `src` parameter or variable.
@@ -80,20 +137,47 @@ class GroupBase(object):
         if n == 0:
             return np.zeros(0)
 
-        ret = None
-        models = self.idx2model(idx)
-        for i, idx in enumerate(idx):
-            uid = models[i].idx2uid(idx)
-            instance = models[i].__dict__[src]
-            val = instance.__dict__[attr][uid]
-
-            # deduce the type for ret
-            if ret is None:
-                if isinstance(val, str):
-                    ret = [''] * n
-                else:
-                    ret = np.zeros(n)
-            ret[i] = val
+        return self.get_by_uid(src, self.idx2mid_uid(idx), attr=attr)
+
+    def get_by_uid(self, src: str, uid, attr: str = 'v'):
+        """
+        Get the `attr` field of the `src` parameter or variable with the result of ``idx2mid_uid``.
+
+        Looking up idx once with ``idx2mid_uid`` and getting multiple fields with this method saves repeated
+        lookups.
+
+        Parameters
+        ----------
+        src : str
+            param or var name
+        uid : tuple
+            ``(mid, uid)`` returned by ``idx2mid_uid``
+        attr
+            The attribute of the param or var to retrieve
+
+        Returns
+        -------
+        The requested param or variable attribute
+        """
+        self._check_src(src)
+
+        mid, uid = uid
+        n = len(uid)
+        if n == 0:
+            return np.zeros(0)
+
+        # deduce the type for ret from the first element
+        first = self._index_models[mid[0]].__dict__[src].__dict__[attr][uid[0]]
+        ret = [''] * n if isinstance(first, str) else np.zeros(n)
+
+        for k in np.unique(mid):
+            rows = np.flatnonzero(mid == k)
+            values = self._index_models[k].__dict__[src].__dict__[attr]
+            if isinstance(values, np.ndarray) and isinstance(ret, np.ndarray):
+                ret[rows] = values[uid[rows]]
+            else:
+                for row, i in zip(rows.tolist(), uid[rows].tolist()):
+                    ret[row] = values[i]
 
         return ret
 
@@ -103,13 +187,19 @@ class GroupBase(object):
 
         if isinstance(value, (float, str, int)):
             value = [value] * len(idx)
-
-        models = self.idx2model(idx)
-        for i, idx in enumerate(idx):
-            model = models[i]
-            uid = model.idx2uid(idx)
-            instance = model.__dict__[src]
-            instance.__dict__[attr][uid] = value[i]
+        if len(idx) == 0:
+            return
+
+        mid, uid = self.idx2mid_uid(idx)
+        for k in np.unique(mid):
+            rows = np.flatnonzero(mid == k)
+            instance = self._index_models[k].__dict__[src]
+            values = instance.__dict__[attr]
+            if isinstance(values, np.ndarray):
+                values[uid[rows]] = np.asarray(value)[rows]
+            else:
+                for row, i in zip(rows.tolist(), uid[rows].tolist()):
+                    values[i] = value[row]
 
     def _check_src(self, src: str):
         if src not in self.common_vars + self.common_params:
@@ -159,6 +249,56 @@ class GroupBase(object):
 
         return idx
 
+    def get_next_idx_batch(self, idx=None, n=0, model_name=None):
+        """
+        Return a list of unique idx for ``n`` new elements.
+
+        Entries of ``idx`` that are None or conflict with existing or preceding entries are replaced by
+        auto-generated idx, as in ``get_next_idx``.
+
+        Parameters
+        ----------
+        idx : list, optional
+            Requested idx of the new elements. If None, all idx will be generated.
+        n : int
+            Number of new elements, used only when ``idx`` is None
+        model_name : str, optional
+            Model name as the prefix of generated idx
+
+        Returns
+        -------
+        list
+            idx of the new elements
+        """
+        if model_name is None:
+            model_name = self.class_name
+        if idx is None:
+            idx = [None] * n
+        else:
+            if hasattr(idx, 'tolist'):
+                idx = idx.tolist()
+            idx = [None if (isinstance(item, float) and math.isnan(item)) else item for item in idx]
+
+        unique = set(idx)
+        if None not in unique and len(unique) == len(idx) and unique.isdisjoint(self._idx2model):
+            return idx
+
+        taken = set()
+        count = len(self._idx2model)
+        for i, item in enumerate(idx):
+            if item is None or item in self._idx2model or item in taken:
+                if item is not None:
+                    logger.debug(f"{self.class_name}: conflict idx {item}. Data may be inconsistent.")
+                while True:
+                    item = model_name + '_' + str(count)
+                    if item not in self._idx2model and item not in taken:
+                        break
+                    count += 1
+                idx[i] = item
+            taken.add(item)
+
+        return idx
+
     def doc(self, export='plain'):
         out = ''
         if export == 'rest':
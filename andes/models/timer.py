@@ -31,7 +31,7 @@ class Toggler(TogglerData, Model):
         action = False
         for i in range(self.n):
             if is_time[i] and (self.u.v[i] == 1):
-                instance = self.system.__dict__[self.model.v[i]]
+                instance = getattr(self.system, self.model.v[i])
                 u0 = instance.get(src='u', attr='v', idx=self.dev.v[i])
                 instance.set(src='u', attr='v', idx=self.dev.v[i], value=1-u0)
                 action = True
@@ -111,3 +111,14 @@ class Fault(ModelData, Model):
                 tqdm.write(f'<Fault {i}>: Clearing fault on {self.bus.v[i]} at {self.tc.v[i]}.')
                 return True
         return False
+
+    def get_state(self):
+        """Return the model state including the stored pre-fault bus voltages."""
+        state = super().get_state()
+        state['vstore'] = np.array(self._vstore)
+        return state
+
+    def set_state(self, state):
+        """Restore the model state including the stored pre-fault bus voltages."""
+        super().set_state(state)
+        self._vstore = np.array(state['vstore'])
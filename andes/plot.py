@@ -5,12 +5,15 @@ Andes plotting tool
 import logging
 import os
 import re
+from collections import OrderedDict
 from distutils.spawn import find_executable
 
 from andes.utils.misc import is_notebook
 from andes.core.var import Algeb, State
 from andes.main import config_logger
-from andes.shared import np, mpl, plt
+from andes.variables.dae import DAETimeSeries
+from andes.variables.stream import load_segments
+from andes.shared import np, mpl, plt, yaml
 
 config_logger(log_file=None)
 logger = logging.getLogger(__name__)
@@ -20,9 +23,13 @@ class TDSData(object):
     """
     A time-domain simulation data container for loading, extracing and
     plotting data
+
+    In the file mode, npy files are opened as read-only memory maps, and the columns
+    retrieved by ``get_values`` are read on demand and cached.
+    At most ``cache_size`` recently used columns are kept in memory.
     """
 
-    def __init__(self, file_name_full=None, mode='file', dae=None, path=None):
+    def __init__(self, file_name_full=None, mode='file', dae=None, path=None, cache_size=32):
         # paths and file names
         self._mode = mode
         self.file_name_full = file_name_full
@@ -30,13 +37,18 @@ class TDSData(object):
         self._path = path if path else os.getcwd()
         self.file_name = None
         self._npy_file = None
+        self._npz_file = None
         self._lst_file = None
 
         # data members for raw data
         self._idx = []  # indices of variables
         self._uname = []  # unformatted variable names
         self._fname = []  # formatted variable names
+        self._index = OrderedDict()  # name index for `find`
+        self._unindexed = []  # positions of names not in the index
         self._data = []  # data loaded from file
+        self._cache = OrderedDict()  # least-recently-used cache of columns read from memory maps
+        self.cache_size = cache_size
 
         # auxillary data members for fast query
         self.t = []
@@ -54,6 +66,7 @@ class TDSData(object):
     def _process_names(self):
         self.file_name, _ = os.path.splitext(self.file_name_full)
         self._npy_file = os.path.join(self._path, self.file_name + '.npy')
+        self._npz_file = os.path.join(self._path, self.file_name + '.npz')
         self._lst_file = os.path.join(self._path, self.file_name + '.lst')
         self._csv_file = os.path.join(self._path, self.file_name + '.csv')
 
@@ -61,14 +74,20 @@ class TDSData(object):
         """Load from DAE time series"""
         dae = self.dae
         self.t = dae.ts.t
-        self.nvars = dae.n + dae.m + dae.o + 1
 
+        self._uname = ['Time [s]'] + dae.ts.xy_name + dae.z_name
+        self._fname = ['$Time [s]$'] + dae.ts.xy_tex_name + dae.z_tex_name
+        self.nvars = len(self._uname)
         self._idx = list(range(self.nvars))
-        self._uname = ['Time [s]'] + dae.x_name + dae.y_name + dae.z_name
-        self._fname = ['$Time [s]$'] + dae.x_tex_name + dae.y_tex_name + dae.z_tex_name
-        self._data = dae.ts.txyz
+        self._data = dae.ts
+        self._build_index()
 
         self.file_name = dae.system.files.name
+        files = dae.system.files
+        base = os.path.splitext(files.npy)[0] if files.npy else os.path.join(self._path, f'{files.name}_out')
+        self._npy_file = base + '.npy'
+        self._lst_file = base + '.lst'
+        self._csv_file = base + '.csv'
 
     def load_lst(self):
         """
@@ -99,11 +118,78 @@ class TDSData(object):
         self._fname = fname
         self._uname = uname
         self.nvars = len(uname)
+        self._build_index()
+
+    def _build_index(self):
+        """
+        Build the name index ``{model: {var: {uid: position}}}`` from unformatted names.
+
+        Names are in the format of ``Model var uid``. Positions are into `_idx`.
+        Positions of names in other formats are kept in `_unindexed`.
+        """
+        index = OrderedDict()
+        unindexed = list()
+        for pos, name in enumerate(self._uname):
+            tokens = name.split(' ')
+            if len(tokens) != 3 or not tokens[2].isdigit() or \
+                    not all(re.fullmatch(r'\w+', token) for token in tokens[:2]):
+                unindexed.append(pos)
+                continue
+            index.setdefault(tokens[0], OrderedDict()).setdefault(tokens[1], OrderedDict())[tokens[2]] = pos
+        self._index = index
+        self._unindexed = unindexed
+
+    def _find_index(self, query):
+        """
+        Find the unformatted names containing `query` using the name index.
+
+        `query` needs to be one to three words separated by single spaces, such as ``GENROU omega``.
+        The result is the same as searching `query` as a regular expression in all the names, where
+        ``A b c`` matches names ``Model var uid`` with ``Model`` ending with ``A``, ``var`` equal to ``b``
+        and ``uid`` starting with ``c``.
+
+        Returns
+        -------
+        list or None
+            Sorted positions of the matched names, or None if `query` is not in the form.
+        """
+        tokens = query.split(' ')
+        if not (1 <= len(tokens) <= 3) or not all(re.fullmatch(r'\w+', token) for token in tokens):
+            return None
+        if len(tokens) == 1 and tokens[0].isdigit():
+            # digits can match in uids of all names
+            return None
+
+        positions = [pos for pos in self._unindexed if re.search(query, self._uname[pos])]
+        if len(tokens) == 1:
+            a = tokens[0]
+            for model, variables in self._index.items():
+                for var, uids in variables.items():
+                    if a in model or a in var:
+                        positions.extend(uids.values())
+        elif len(tokens) == 2:
+            a, b = tokens
+            for model, variables in self._index.items():
+                for var, uids in variables.items():
+                    if model.endswith(a) and var.startswith(b):
+                        positions.extend(uids.values())
+                    elif var.endswith(a):
+                        positions.extend(pos for uid, pos in uids.items() if uid.startswith(b))
+        else:
+            a, b, c = tokens
+            for model, variables in self._index.items():
+                if model.endswith(a) and b in variables:
+                    positions.extend(pos for uid, pos in variables[b].items() if uid.startswith(c))
+        return sorted(positions)
 
     def find(self, query, exclude=None, formatted=False):
         """
         Return variable names and indices matching `query`
 
+        `query` is a regular expression searched in the names. Queries of plain words separated by single
+        spaces, such as ``GENROU omega``, are looked up in the name index of the unformatted names
+        with the same result.
+
         Parameters
         ----------
         query : str
@@ -124,6 +210,15 @@ class TDSData(object):
 
         found_idx, found_names = list(), list()
 
+        positions = self._find_index(query) if formatted is False else None
+        if positions is not None:
+            for pos in positions:
+                if exclude and re.search(exclude, names[pos]):
+                    continue
+                found_idx.append(self._idx[pos])
+                found_names.append(names[pos])
+            return found_idx, found_names
+
         for idx, name in zip(self._idx, names):
             if re.search(query, name):
                 if exclude and re.search(exclude, name):
@@ -136,7 +231,10 @@ class TDSData(object):
 
     def load_npy_or_csv(self, delimiter=','):
         """
-        Load the npy or csv file into internal data structures `self._data`
+        Load the npy or csv file into internal data structures `self._data`.
+
+        If the npy file is not found, the npz file, or the npy segments written by the streaming writer,
+        will be loaded in order.
 
         Parameters
         ----------
@@ -148,11 +246,47 @@ class TDSData(object):
         None
         """
         try:
-            data = np.load(self._npy_file)
+            data = np.load(self._npy_file, mmap_mode='r')
         except FileNotFoundError:
-            data = np.loadtxt(self._csv_file, delimiter=delimiter, skiprows=1)
+            if os.path.isfile(self._npz_file):
+                data = self._load_npz()
+            else:
+                # partial results streamed by an interrupted simulation
+                data = load_segments(self._npy_file)
+            if data is None:
+                data = np.loadtxt(self._csv_file, delimiter=delimiter, skiprows=1)
 
         self._data = data
+        self._cache = OrderedDict()
+
+    def _load_npz(self):
+        """
+        Load the npz file written by ``DAE.write_npz`` into a ``DAETimeSeries`` in the stored dtypes.
+        """
+        with np.load(self._npz_file) as f:
+            t, xy = f['t'], f['xy']
+            if 'z_bits' in f:
+                z = np.unpackbits(f['z_bits'], axis=1)[:, :int(f['nz'])]
+            else:
+                z = f['z']
+
+        data = DAETimeSeries(dtype=xy.dtype, z_dtype=z.dtype)
+        data.set_arrays(t, xy, z)
+        return data
+
+    def _get_column(self, i):
+        """
+        Return the column ``i`` from the memory map through the cache.
+        """
+        if i in self._cache:
+            self._cache.move_to_end(i)
+            return self._cache[i]
+
+        col = np.array(self._data[:, i])
+        self._cache[i] = col
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return col
 
     def get_values(self, idx):
         """
@@ -168,7 +302,17 @@ class TDSData(object):
         np.ndarray
             Variable data
         """
-        return self._data[:, idx]
+        if not isinstance(self._data, np.memmap):
+            return self._data[:, idx]
+
+        if isinstance(idx, (int, np.integer)):
+            return self._get_column(int(idx))
+
+        idx = [int(i) for i in np.ravel(idx)]
+        if len(idx) > self.cache_size:
+            # read many columns at once without polluting the cache
+            return np.array(self._data[:, idx])
+        return np.column_stack([self._get_column(i) for i in idx]) if idx else self._data[:, idx]
 
     def get_header(self, idx, formatted=False):
         """
@@ -233,6 +377,66 @@ class TDSData(object):
 
         logger.info(f'CSV data saved in <{path}>.')
 
+    def export(self, fmt, path=None, idx=None, formatted=False):
+        """
+        Export to a binary columnar file in the Parquet or Feather format.
+
+        Each variable is stored in a column named by its unformatted (or formatted) name.
+        The column metadata contains the other name in ``name`` or ``tex_name`` and the index in ``idx``.
+        Requires the optional package ``pyarrow``.
+
+        Parameters
+        ----------
+        fmt : str
+            ``parquet`` or ``feather``
+        path : str, optional
+            path of the file to save. Use the output name with the format extension by default
+        idx : None or array-like, optional
+            the indices of the variables to export. Export all by default
+        formatted : bool, optional
+            Use LaTeX-formatted names as column names
+
+        Returns
+        -------
+        bool
+            True if the file is written
+        """
+        if fmt not in ('parquet', 'feather'):
+            raise ValueError(f'Unknown export format <{fmt}>.')
+        try:
+            import pyarrow as pa  # NOQA
+            import pyarrow.feather  # NOQA
+            import pyarrow.parquet  # NOQA
+        except ImportError:
+            logger.error(f'Package <pyarrow> is required to export to {fmt}. Install it with pip.')
+            return False
+
+        if not path:
+            path = os.path.splitext(self._csv_file)[0] + '.' + fmt
+        if not idx:
+            idx = self._idx
+
+        positions = {i: pos for pos, i in enumerate(self._idx)}
+        names = self._uname if not formatted else self._fname
+        other_names = self._fname if not formatted else self._uname
+        other_key = b'tex_name' if not formatted else b'name'
+
+        fields, columns = list(), list()
+        for i in idx:
+            pos = positions[i]
+            meta = {other_key: other_names[pos].encode(), b'idx': str(i).encode()}
+            fields.append(pa.field(names[pos], pa.float64(), metadata=meta))
+            columns.append(pa.array(self.get_values(i)))
+        table = pa.Table.from_arrays(columns, schema=pa.schema(fields))
+
+        if fmt == 'parquet':
+            pa.parquet.write_table(table, path)
+        else:
+            pa.feather.write_feather(table, path)
+
+        logger.info(f'{fmt.capitalize()} data saved in <{path}>.')
+        return True
+
     def plot(self, yidx, xidx=(0,), a=None, ycalc=None,
              left=None, right=None, ymin=None, ymax=None, ytimes=None,
              xlabel=None, ylabel=None, legend=True, grid=False,
@@ -307,11 +511,31 @@ class TDSData(object):
         """Convert to pandas.DataFrame"""
         pass
 
-    def guess_event_time(self):
+    def guess_event_time(self, idx=None, tol=1e-6, jump=0.25):
         """Guess the event starting time from the input data by checking
         when the values start to change
+
+        Besides the time when the values start to change from the initial values,
+        times of abrupt changes are also returned. See ``guess_event_index``.
+
+        Parameters
+        ----------
+        idx : list, optional
+            The indices of the variables to check. All variables by default
+        tol : float
+            Tolerance for a value to be considered changed from the initial
+        jump : float
+            Threshold of a step change relative to the value range to be considered abrupt
+
+        Returns
+        -------
+        np.ndarray
+            Event times in ascending order
         """
-        pass
+        if idx is None:
+            idx = self._idx[1:]
+        rows = guess_event_index(self.get_values(idx), tol=tol, jump=jump)
+        return np.ravel(self.get_values(0))[rows]
 
     def bqplot_data(self, xdata, ydata, xheader=None, yheader=None, xlabel=None, ylabel=None,
                     left=None, right=None, ymin=None, ymax=None, legend=True, grid=False, fig=None,
@@ -339,11 +563,14 @@ class TDSData(object):
 
     def plot_data(self, xdata, ydata, xheader=None, yheader=None, xlabel=None, ylabel=None, line_styles=None,
                   left=None, right=None, ymin=None, ymax=None, legend=True, grid=False, fig=None, ax=None,
-                  latex=True, dpi=100, greyscale=False, savefig=None, show=True, **kwargs):
+                  latex=True, dpi=100, greyscale=False, savefig=None, show=True, max_points=2000, **kwargs):
         """
         Plot lines for the supplied data and options. This functions takes `xdata` and `ydata` values. If
         you provide variable indices instead of values, use `plot()`.
 
+        If there are more than `max_points` samples, the data is decimated by keeping the minimum and maximum
+        of each bucket (see ``minmax_index``), so that the shape of curves and the event spikes are preserved.
+
         Parameters
         ----------
         xdata : array-like
@@ -391,10 +618,12 @@ class TDSData(object):
             Dots per inch for screen print or save
         greyscale : bool
             True to use greyscale, False otherwise
-        savefig : bool
-            True to save to png figure file
+        savefig : bool or str
+            True to save to png figure file, or the path of the figure file to save
         show : bool
             True to show the image
+        max_points : int or None
+            The approximate budget of points per curve. ``None`` or 0 to plot all samples
 
         kwargs
             Optional kwargs
@@ -411,6 +640,11 @@ class TDSData(object):
         if ydata.ndim == 1:
             ydata = ydata.reshape((-1, 1))
 
+        if max_points and len(ydata) > max_points:
+            rows = minmax_index(ydata, max_points, keep=guess_event_index(ydata))
+            xdata = xdata[rows]
+            ydata = ydata[rows]
+
         n_lines = ydata.shape[1]
 
         mpl.rc('font', family='Arial', size=12)
@@ -460,15 +694,17 @@ class TDSData(object):
         ax.set_ylim(ymin=ymin, ymax=ymax)
 
         if grid:
-            ax.grid(b=True, linestyle='--')
+            ax.grid(True, linestyle='--')
 
         if legend:
             if yheader:
                 ax.legend()
 
-        plt.draw()
+        fig.canvas.draw_idle()
 
-        if savefig:
+        if isinstance(savefig, str):
+            outfile = savefig
+        elif savefig:
             count = 1
 
             while True:
@@ -477,6 +713,7 @@ class TDSData(object):
                     break
                 count += 1
 
+        if savefig:
             try:
                 fig.savefig(outfile, dpi=dpi)
                 logger.info(f'Figure saved to <{outfile}>')
@@ -490,6 +727,90 @@ class TDSData(object):
         return fig, ax
 
 
+def minmax_index(ydata, max_points, keep=None):
+    """
+    Return the row indices for min/max decimation of `ydata`.
+
+    Rows are split into ``max_points // 2`` buckets, and the rows of the minimum and the maximum
+    in each bucket are selected for each column. The first and the last rows and the rows in `keep`
+    are always selected.
+
+    Parameters
+    ----------
+    ydata : np.ndarray
+        Data with one column per curve
+    max_points : int
+        The approximate number of points per curve
+    keep : array-like, optional
+        Row indices to keep, e.g., the event indices
+
+    Returns
+    -------
+    np.ndarray
+        Sorted unique row indices
+    """
+    if ydata.ndim == 1:
+        ydata = ydata.reshape((-1, 1))
+    n = ydata.shape[0]
+    n_buckets = max(max_points // 2, 1)
+    if n <= max_points:
+        return np.arange(n)
+
+    bucket = np.arange(n) * n_buckets // n
+    starts = np.searchsorted(bucket, np.arange(n_buckets))
+    ends = np.append(starts[1:], n) - 1
+
+    out = [np.array([0, n - 1])]
+    if keep is not None:
+        out.append(np.ravel(keep).astype(int))
+    for col in ydata.T:
+        # sort by bucket then value: the first in each bucket is the minimum and the last is the maximum
+        order = np.lexsort((col, bucket))
+        out.append(order[starts])
+        out.append(order[ends])
+
+    return np.unique(np.concatenate(out))
+
+
+def guess_event_index(ydata, tol=1e-6, jump=0.25):
+    """
+    Guess the row indices of events from the data.
+
+    Returned are the row where any value starts to deviate from its initial value by more than `tol`,
+    and the rows around step changes larger than `jump` times the value range of the column.
+
+    Parameters
+    ----------
+    ydata : np.ndarray
+        Data with one column per variable
+    tol : float
+        Tolerance for a value to be considered changed from the initial
+    jump : float
+        Threshold of a step change relative to the value range
+
+    Returns
+    -------
+    np.ndarray
+        Sorted unique row indices
+    """
+    if ydata.ndim == 1:
+        ydata = ydata.reshape((-1, 1))
+    if len(ydata) < 2:
+        return np.array([], dtype=int)
+
+    out = []
+    changed = np.where(np.any(np.abs(ydata - ydata[0]) > tol, axis=1))[0]
+    if len(changed):
+        out.append(changed[:1])
+
+    span = np.ptp(ydata, axis=0)
+    span[span == 0] = np.inf
+    steps = np.where(np.any(np.abs(np.diff(ydata, axis=0)) > jump * span, axis=1))[0]
+    out.extend([steps, steps + 1])
+
+    return np.unique(np.concatenate(out)).astype(int) if out else np.array([], dtype=int)
+
+
 def parse_y(y, upper, lower=0):
     """
     Parse command-line input for Y indices and return a list of indices
@@ -605,7 +926,7 @@ def eig_plot(name, args):
         pass
 
 
-def tdsplot(filename, y, x=(0,), tocsv=False, **kwargs):
+def tdsplot(filename, y, x=(0,), tocsv=False, export=None, batch=None, ncpu=None, **kwargs):
     """
     TDS plot main function based on the new TDSData class
 
@@ -617,18 +938,35 @@ def tdsplot(filename, y, x=(0,), tocsv=False, **kwargs):
         The index for the x-axis variable. x=0 by default for time
     y : list or int
         The indices for the y-axis variable
+    export : str, optional
+        Export the data to ``parquet`` or ``feather`` instead of plotting
+    batch : str, optional
+        Path to a plot specification file for rendering figures in batch. See ``batch_plot``
+    ncpu : int, optional
+        Number of processes for batch plotting
 
     Returns
     -------
     TDSData object
     """
 
+    if isinstance(x, int):
+        x = [x]
+
     # single data file
     if len(filename) == 1:
+        if batch:
+            return batch_plot(filename[0], batch, ncpu=ncpu)
         tds_data = TDSData(filename[0])
         if tocsv is True:
             tds_data.export_csv()
             return
+        if export:
+            idx = None
+            if y:
+                idx = list(x) + [i for i in parse_y(y, lower=0, upper=tds_data.nvars) if i not in x]
+            tds_data.export(export, idx=idx)
+            return
         y_num = parse_y(y, lower=0, upper=tds_data.nvars)
         tds_data.plot(xidx=x, yidx=y_num, **kwargs)
         return tds_data
@@ -636,6 +974,124 @@ def tdsplot(filename, y, x=(0,), tocsv=False, **kwargs):
         raise NotImplementedError("Plotting multiple data files are not supported yet")
 
 
+_batch_data = None  # TDSData opened once in each batch plotting worker
+
+
+def _batch_init(file_name_full):
+    """
+    Initialize a batch plotting worker with the non-interactive backend and the memory-mapped data.
+    """
+    global _batch_data
+    mpl.use('Agg')
+    _batch_data = TDSData(file_name_full)
+
+
+def _batch_render(fig_spec, tds_data=None):
+    """
+    Render a figure from its specification on an ``Agg`` canvas without pyplot.
+
+    Parameters
+    ----------
+    fig_spec : dict
+        Figure specification with the output path in ``name``
+    tds_data : TDSData, optional
+        Data to plot. The data opened by ``_batch_init`` in a batch plotting worker if None
+
+    Returns
+    -------
+    (str, str or None)
+        Path of the figure and the error message if failed
+    """
+    from matplotlib.figure import Figure  # NOQA
+    from matplotlib.backends.backend_agg import FigureCanvasAgg  # NOQA
+
+    tds_data = _batch_data if tds_data is None else tds_data
+    fig_spec = dict(fig_spec)
+    outfile = fig_spec.pop('name')
+    try:
+        x = fig_spec.pop('x', 0)
+        y = fig_spec.pop('y')
+        if isinstance(y, str):
+            y = tds_data.find(y, exclude=fig_spec.pop('exclude', None))[0]
+        if len(y) == 0:
+            return outfile, 'no variable found'
+        fig_spec.setdefault('latex', False)
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        tds_data.plot(yidx=y, xidx=x, savefig=outfile, show=False, fig=fig, ax=fig.add_subplot(111), **fig_spec)
+    except Exception as e:
+        return outfile, repr(e)
+    return outfile, None
+
+
+def batch_plot(file_name_full, spec, ncpu=None):
+    """
+    Render figures listed in a specification file using a pool of processes.
+
+    The specification is a YAML list of figures. Each figure has a ``y`` field with a variable query
+    (see ``TDSData.find``) or a list of indices, and optional ``name``, ``x``, ``exclude`` and
+    keyword arguments to ``TDSData.plot``, for example ::
+
+        - name: bus_voltages.png
+          y: Bus v
+          ylabel: Voltage [pu]
+        - name: rotor_speed.pdf
+          y: GENROU omega
+          grid: true
+
+    Figures are rendered on ``Agg`` canvases without switching the pyplot backend of the caller. Each worker
+    opens the result data once as a memory map, so the pages are shared through the operating system instead
+    of being copied.
+
+    Parameters
+    ----------
+    file_name_full : str
+        Path to the TDS output data file
+    spec : str or list
+        Path to the YAML specification file, or the list of figure specifications
+    ncpu : int, optional
+        Number of processes. Use all CPUs by default
+
+    Returns
+    -------
+    list
+        Paths of the rendered figures
+    """
+    from concurrent.futures import ProcessPoolExecutor  # NOQA
+
+    if isinstance(spec, str):
+        with open(spec, 'r') as f:
+            spec = yaml.safe_load(f)
+
+    base, _ = os.path.splitext(file_name_full)
+    figs = list()
+    for i, fig_spec in enumerate(spec):
+        fig_spec = dict(fig_spec)
+        name = fig_spec.get('name') or f'{base}_{i + 1}'
+        if not os.path.splitext(name)[1]:
+            name += '.png'
+        fig_spec['name'] = name
+        figs.append(fig_spec)
+
+    ncpu = min(ncpu or os.cpu_count(), len(figs))
+    if ncpu <= 1:
+        tds_data = TDSData(file_name_full)
+        results = [_batch_render(item, tds_data) for item in figs]
+    else:
+        with ProcessPoolExecutor(max_workers=ncpu, initializer=_batch_init,
+                                 initargs=(file_name_full,)) as executor:
+            results = list(executor.map(_batch_render, figs))
+
+    saved = list()
+    for outfile, error in results:
+        if error is None:
+            saved.append(outfile)
+        else:
+            logger.error(f'Figure <{outfile}> failed: {error}')
+    logger.info(f'{len(saved)} of {len(figs)} figures saved.')
+    return saved
+
+
 def check_init(yval, yl):
     """"Check initialization by comparing t=0 and t=end values"""
     suspect = []
@@ -19,3 +19,15 @@ class BaseRoutine(object):
     @property
     def class_name(self):
         return self.__class__.__name__
+
+    def get_state(self):
+        """
+        Return the routine state to be stored in a snapshot. To be overloaded by routines.
+        """
+        return OrderedDict()
+
+    def set_state(self, state):
+        """
+        Restore the routine state from a snapshot. To be overloaded by routines.
+        """
+        pass
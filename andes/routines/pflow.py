@@ -17,7 +17,6 @@ class PFlow(BaseRoutine):
                                      ('max_iter', 25),
                                      ('report', 1),
                                      )))
-        self.models = system.get_models_with_flag('pflow')
 
         self.converged = False
         self.inc = None
@@ -25,6 +24,11 @@ class PFlow(BaseRoutine):
         self.niter = None
         self.mis = []
 
+    @property
+    def models(self):
+        """Models with the ``pflow`` flag, which are updated as models are imported."""
+        return self.system._models_with_flag['pflow']
+
     def _initialize(self):
         self.converged = False
         self.inc = None
@@ -1,6 +1,9 @@
+import os
+import re
 from collections import OrderedDict
 
 from andes.routines.base import BaseRoutine
+from andes.variables.stream import StreamWriter
 from andes.utils.misc import elapsed, is_notebook
 from andes.shared import tqdm, np
 from andes.shared import matrix, sparse, spdiag
@@ -22,14 +25,18 @@ class TDS(BaseRoutine):
                                      ('fixt', 1),
                                      ('tstep', 1/30),  # recommended step size
                                      ('max_iter', 15),
+                                     ('stream', 0),
+                                     ('chunk', 1024),
+                                     ('tout', 0),  # output interval; 0 to store every step
+                                     ('event_win', 0.1),  # window around switch times to store every step
+                                     ('interp', 0),  # interpolate onto the uniform output grid
+                                     ('compact', 0),  # store xy in float32 and z in uint8
+                                     ('compress', 0),  # save outputs to a compressed npz file
                                      )))
         # overwrite `tf` from command line
         if system.options.get('tf') is not None:
             self.config.tf = system.options.get('tf')
 
-        self.tds_models = system.get_models_with_flag('tds')
-        self.pflow_tds_models = system.get_models_with_flag(('tds', 'pflow'))
-
         # to be computed
         self.deltat = 0
         self.deltatmin = 0
@@ -45,9 +52,162 @@ class TDS(BaseRoutine):
         self.mis = []
         self.pbar = None
         self.plotter = None
+        self.writer = None
+
+        # output decimation
+        self._tout_k = 0  # index of the next output time on the grid
+        self._last_t = None  # time of the last integration step
+        self._last_xy = None  # recorded values of the last integration step
+
+        # recording plan for selected variables
+        self._record_patterns = None
+        self._record_addr = None
+        self._record_x = None
+        self._record_y = None
 
         self.initialized = False
 
+    @property
+    def tds_models(self):
+        """Models with the ``tds`` flag, which are updated as models are imported."""
+        return self.system._models_with_flag['tds']
+
+    @property
+    def pflow_tds_models(self):
+        """Models with the ``tds`` or ``pflow`` flag, which are updated as models are imported."""
+        return self.system._models_with_flag['pflow_and_tds']
+
+    def set_record(self, patterns=None, xy_idx=None):
+        """
+        Set the variables to be recorded in the time series. Record all by default.
+
+        Each pattern is matched in the following order:
+
+        1. ``'Model'`` for all internal variables of a model, e.g., ``'GENROU'``;
+        2. ``'Model var1 var2'`` for the named variables of a model, e.g., ``'GENROU omega delta'``;
+        3. a regular expression searched in the variable names, e.g., ``'Bus v [0-9]$'``.
+
+        The recording plan is resolved into addresses when TDS is initialized.
+
+        Parameters
+        ----------
+        patterns : str or list, optional
+            model and variable name patterns
+        xy_idx : array-like, optional
+            explicit addresses into the concatenated [x, y] array
+
+        Examples
+        --------
+        >>> ss.TDS.set_record(['GENROU omega', 'Bus v'])
+        """
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        self._record_patterns = patterns
+        self._record_addr = xy_idx
+
+    def _resolve_record(self):
+        """
+        Resolve the recording plan into sorted addresses into [x, y] and store the gather indices.
+
+        Returns
+        -------
+        np.ndarray or None
+            Addresses of the recorded variables. `None` if all variables are recorded.
+        """
+        system = self.system
+        dae = system.dae
+        self._record_x, self._record_y = None, None
+        if self._record_patterns is None and self._record_addr is None:
+            return None
+
+        addr = [] if self._record_addr is None else list(np.ravel(self._record_addr))
+        for pattern in (self._record_patterns or []):
+            tokens = pattern.split()
+            if len(tokens) > 0 and tokens[0] in system.models:
+                mdl = system.models[tokens[0]]
+                names = tokens[1:] if len(tokens) > 1 else list(mdl.states) + list(mdl.algebs)
+                for name in names:
+                    if name in mdl.states:
+                        addr.extend(mdl.states[name].a)
+                    elif name in mdl.algebs:
+                        addr.extend(np.array(mdl.algebs[name].a, dtype=int) + dae.n)
+                    else:
+                        logger.warning(f'<{mdl.class_name}> has no internal variable <{name}> to record.')
+            else:
+                found = [i for i, name in enumerate(dae.xy_name) if re.search(pattern, name)]
+                if len(found) == 0:
+                    logger.warning(f'No variable matches the record pattern <{pattern}>.')
+                addr.extend(found)
+
+        addr = np.unique(np.array(addr, dtype=int))
+        if np.any(addr < 0) or np.any(addr >= dae.n + dae.m):
+            raise IndexError(f'Record addresses out of range [0, {dae.n + dae.m}).')
+
+        self._record_x = addr[addr < dae.n]
+        self._record_y = addr[addr >= dae.n] - dae.n
+        logger.debug(f'Recording {len(addr)} out of {dae.n + dae.m} variables.')
+        return addr
+
+    def _get_record_xy(self):
+        """
+        Return the values of the recorded variables in [x, y].
+        """
+        dae = self.system.dae
+        if self._record_x is None:
+            return dae.xy
+        return np.concatenate((dae.x[self._record_x], dae.y[self._record_y]))
+
+    def _store_step(self):
+        """
+        Store the recorded values of the current step subject to the output interval ``config.tout``.
+
+        Steps within ``config.event_win`` seconds of a switch time are always stored.
+        If ``config.interp`` is enabled, values on the uniform output grid are linearly interpolated
+        between integration steps, and discrete flags take the values at the end of the interval.
+        """
+        dae = self.system.dae
+        config = self.config
+        t = dae.t
+        xy = self._get_record_xy()
+        z = self.system.get_z(models=self.pflow_tds_models)
+
+        if config.tout <= 0:
+            dae.ts.store_txyz(t, xy, z)
+            return
+
+        stored = False
+        while self._tout_k * config.tout <= t + 1e-8:
+            tk = self._tout_k * config.tout
+            self._tout_k += 1
+            # the first step has no previous step to interpolate from
+            if config.interp and (self._last_t is not None) and abs(tk - t) > 1e-8:
+                w = (tk - self._last_t) / (t - self._last_t)
+                dae.ts.store_txyz(tk, self._last_xy + w * (xy - self._last_xy), z)
+            elif not stored:
+                # the step on or the first step past a grid point, stored once
+                dae.ts.store_txyz(t, xy, z)
+                stored = True
+
+        if (not stored) and self._near_event(t):
+            dae.ts.store_txyz(t, xy, z)
+
+        self._last_t = t
+        if config.interp:
+            self._last_xy = np.array(xy)
+
+    def _near_event(self, t):
+        """
+        Return if ``t`` is within ``config.event_win`` of any switch time.
+        """
+        times = self.system.switch_times
+        if len(times) == 0:
+            return False
+        i = np.searchsorted(times, t)
+        for j in (i - 1, i):
+            if 0 <= j < len(times) and abs(times[j] - t) <= self.config.event_win + 1e-8:
+                return True
+        return False
+
     def _initialize(self):
         """
         Initialize the status, storage and values for TDS.
@@ -61,17 +221,12 @@ class TDS(BaseRoutine):
         t0, _ = elapsed()
         system = self.system
         self._reset()
-        system.set_address(models=self.tds_models)
-        system.set_dae_names(models=self.tds_models)
-
-        system.dae.resize_array()
-        system.dae.clear_ts()
-        system.store_sparse_pattern(models=self.pflow_tds_models)
-        system.store_adder_setter(models=self.pflow_tds_models)
+        self._setup()
         system.vars_to_models()
         system.initialize(self.tds_models)
         system.store_switch_times(self.tds_models)
         self.initialized = self.test_initialization()
+        self._start_stream()
 
         _, s1 = elapsed(t0)
         if self.initialized is True:
@@ -82,6 +237,23 @@ class TDS(BaseRoutine):
             logger.warning('No dynamic component loaded.')
         return system.dae.xy
 
+    def _setup(self):
+        """
+        Set up the addresses, names, storage and sparsity patterns for TDS models.
+        """
+        system = self.system
+        system.set_address(models=self.tds_models)
+        system.set_dae_names(models=self.tds_models)
+
+        system.dae.resize_array()
+        system.dae.clear_ts()
+        if self.config.compact:
+            system.dae.ts.dtype = np.float32
+            system.dae.ts.z_dtype = np.uint8
+        system.store_sparse_pattern(models=self.pflow_tds_models)
+        system.store_adder_setter(models=self.pflow_tds_models)
+        system.dae.ts.xy_idx = self._resolve_record()
+
     def summary(self):
         """
         Print out a summary to logger.info.
@@ -100,7 +272,7 @@ class TDS(BaseRoutine):
         out_str = '\n'.join(out)
         logger.info(out_str)
 
-    def run(self, verbose=False):
+    def run(self, verbose=False, resume=False):
         """
         Run the implicit numerical integration for TDS.
 
@@ -108,37 +280,55 @@ class TDS(BaseRoutine):
         ----------
         verbose : bool
             verbosity flag for single integration steps
+        resume : bool
+            continue from the current time, e.g., after ``System.restore``, without re-initialization
         """
         system = self.system
         dae = self.system.dae
         config = self.config
 
         self.summary()
-        self._initialize()
-        self.pbar = tqdm(total=100, ncols=70, unit='%')
+        initial = 0
+        if resume and dae.t > 0:
+            self._resume()
+            initial = int(self.next_pc) - 1  # the whole-number percentage already completed
+        else:
+            self._initialize()
+        self.pbar = tqdm(total=100, ncols=70, unit='%', initial=initial)
 
         t0, _ = elapsed()
-        while (system.dae.t < self.config.tf) and (not self.busted):
-            if self.calc_h() == 0:
-                logger.error("Time step calculated to zero. Simulation terminated.")
-                break
-
-            if self._implicit_step():
-                # store values
-                dae.ts.store_txyz(dae.t, dae.xy, self.system.get_z(models=self.pflow_tds_models))
-                dae.t += self.h
-
-                # show progress in percentage
-                perc = max(min((dae.t - config.t0) / (config.tf - config.t0) * 100, 100), 0)
-                if perc >= self.next_pc:
-                    self.pbar.update(1)
-                    self.next_pc += 1
-
-            # check if the next step is critical time
-            if self.is_switch_time():
-                self._last_switch_t = system.switch_times[self._switch_idx]
-                system.switch_action(self.pflow_tds_models)
-                system.vars_to_models()
+        try:
+            while (system.dae.t < self.config.tf) and (not self.busted):
+                if self.calc_h() == 0:
+                    logger.error("Time step calculated to zero. Simulation terminated.")
+                    break
+
+                if self._implicit_step():
+                    # store values
+                    self._store_step()
+                    if self.writer is not None:
+                        self._stream_step()
+                    dae.t += self.h
+
+                    # show progress in percentage
+                    perc = max(min((dae.t - config.t0) / (config.tf - config.t0) * 100, 100), 0)
+                    if perc >= self.next_pc:
+                        self.pbar.update(1)
+                        self.next_pc += 1
+
+                # check if the next step is critical time
+                if self.is_switch_time():
+                    self._last_switch_t = system.switch_times[self._switch_idx]
+                    system.switch_action(self.pflow_tds_models)
+                    system.ops_reset(self.pflow_tds_models)
+                    system.vars_to_models()
+        except BaseException:
+            # keep the written segments as partial results
+            if self.writer is not None:
+                self._stop_stream(merge=False)
+                logger.error(f'Simulation interrupted. Partial results are kept in segments of '
+                             f'<{system.files.npy}>.')
+            raise
 
         self.pbar.close()
         _, s1 = elapsed(t0)
@@ -150,9 +340,74 @@ class TDS(BaseRoutine):
         if is_notebook():
             self.load_plotter()
 
+    def _start_stream(self):
+        """
+        Write the lst file and start the streaming writer if ``config.stream`` is enabled.
+        """
+        system = self.system
+        if (not self.config.stream) or system.files.no_output:
+            self.writer = None
+            return
+
+        system.dae.ts.chunk = int(self.config.chunk)
+        system.dae.write_lst(system.files.lst)
+        self.writer = StreamWriter(system.files.npy)
+
+    def _stream_step(self):
+        """
+        Hand the stored time series to the writer once a chunk is filled.
+        """
+        ts = self.system.dae.ts
+        if len(ts) >= self.config.chunk:
+            self.writer.write(ts.detach())
+
+    def _stop_stream(self, merge=True):
+        """
+        Flush the remaining time series and close the writer.
+        """
+        self.writer.write(self.system.dae.ts.detach())
+        ret = self.writer.close(merge=merge)
+        self.writer = None
+        return ret
+
+    def _resume(self):
+        """
+        Prepare for continuing the simulation from the current time.
+
+        Switch times are collected again so that timer parameters changed after a restore take effect.
+        Events at or before the current time are considered processed.
+        """
+        system = self.system
+        system.store_switch_times(self.tds_models)
+        self._switch_idx = int(np.sum(system.switch_times <= system.dae.t + 1e-8)) - 1
+        self.busted = False
+        self.next_pc = int(max(min((system.dae.t - self.config.t0) / (self.config.tf - self.config.t0) * 100,
+                                   100), 0)) + 1
+        logger.info(f'Resuming simulation from t={system.dae.t:.4g}s.')
+
+    def get_state(self):
+        """
+        Return the stepping state of TDS for snapshots.
+        """
+        state = OrderedDict()
+        for name in ('deltat', 'deltatmin', 'deltatmax', 'h', 'converged', 'busted', 'niter',
+                     '_switch_idx', '_last_switch_t', 'initialized', '_tout_k', '_last_t', '_last_xy'):
+            state[name] = self.__dict__[name]
+        return state
+
+    def set_state(self, state):
+        """
+        Restore the stepping state of TDS from ``state`` returned by ``get_state``.
+        """
+        self.__dict__.update(state)
+
     def load_plotter(self):
         from andes.plot import TDSData  # NOQA
-        self.plotter = TDSData(mode='memory', dae=self.system.dae)
+        if len(self.system.dae.ts) == 0 and (not self.system.files.no_output):
+            # time series have been streamed to disk
+            self.plotter = TDSData(self.system.files.npy)
+        else:
+            self.plotter = TDSData(mode='memory', dae=self.system.dae)
 
     def test_initialization(self):
         """
@@ -279,6 +534,9 @@ class TDS(BaseRoutine):
         """
         Save the simulation data into two files: a lst file and a npy file.
 
+        If ``config.compact`` or ``config.compress`` is enabled, a npz file is written in place of the npy file,
+        and the stale npy file of the same name is removed.
+
         Returns
         -------
         bool
@@ -288,8 +546,18 @@ class TDS(BaseRoutine):
             return False
         else:
             t0, _ = elapsed()
-            self.system.dae.write_lst(self.system.files.lst)
-            self.system.dae.write_npy(self.system.files.npy)
+            files = self.system.files
+            if self.writer is not None:
+                self._stop_stream()
+            elif self.config.compact or self.config.compress:
+                self.system.dae.write_lst(files.lst)
+                self.system.dae.write_npz(os.path.splitext(files.npy)[0] + '.npz',
+                                          compress=bool(self.config.compress))
+                if os.path.isfile(files.npy):
+                    os.remove(files.npy)
+            else:
+                self.system.dae.write_lst(files.lst)
+                self.system.dae.write_npy(files.npy)
             _, s1 = elapsed(t0)
             logger.info(f'TDS outputs saved in {s1}.')
             return True
@@ -430,6 +698,11 @@ class TDS(BaseRoutine):
         self.system.dae.t = 0.0
         self.pbar = None
         self.plotter = None
+        self.writer = None
+
+        self._tout_k = 0
+        self._last_t = None
+        self._last_xy = None
 
         self.initialized = False
 
@@ -469,6 +742,7 @@ class TDS(BaseRoutine):
         if self.is_switch_time():
             self._last_switch_t = system.switch_times[self._switch_idx]
             system.switch_action(self.pflow_tds_models)
+            system.ops_reset(self.pflow_tds_models)
 
         while True:
             system.e_clear(models=self.pflow_tds_models)
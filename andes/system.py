@@ -12,8 +12,10 @@ from typing import List, Dict, Tuple, Union, Optional
 
 from andes.variables.fileman import FileMan
 from andes.variables.dae import DAE
+from andes.variables.snapshot import Snapshot
 from andes.routines import all_routines
 from andes.models import non_jit
+from andes.models.group import GroupBase
 from andes.core.param import BaseParam
 from andes.core.model import Model
 from andes.core.var import ExtVar
@@ -47,10 +49,13 @@ class System(object):
         if kwargs:
             self.options.update(kwargs)
         self.calls = OrderedDict()
-        self.models = OrderedDict()
+        self._dilled_calls = OrderedDict()  # serialized calls of each model not yet loaded
+        self.models = OrderedDict()  # instantiated models in the order of `models.non_jit`
+        self._model_files = OrderedDict()  # all model names and their module names
         self.groups = OrderedDict()
         self.programs = OrderedDict()
         self.switch_times = np.array([])
+        self.is_setup = False
 
         # get and load default config file
         self.config = Config(self.__class__.__name__)
@@ -74,10 +79,7 @@ class System(object):
         self._model_import()
         self._routine_import()
 
-        self._models_with_flag = {'pflow': self.get_models_with_flag('pflow'),
-                                  'tds': self.get_models_with_flag('tds'),
-                                  'pflow_and_tds': self.get_models_with_flag(('tds', 'pflow')),
-                                  }
+        self._update_models_with_flag()
 
         # ------------------------------
         # FIXME: reduce clutter with defaultdict `adders` and `setters`, each with `x`, `y`, `f`, and `g`
@@ -95,6 +97,7 @@ class System(object):
 
         Anything in this function should be independent of test case
         """
+        self.import_models()
         self._generate_symbols()
         self._generate_equations()
         self._generate_jacobians()
@@ -111,6 +114,7 @@ class System(object):
 
         This function is to be called after all data are added.
         """
+        self.load_calls()
         self.set_address()
         self.set_dae_names()
         self._collect_ref_param()
@@ -118,6 +122,7 @@ class System(object):
         self.calc_pu_coeff()
         self.store_sparse_pattern()
         self.store_adder_setter()
+        self.is_setup = True
 
     def reset(self):
         """
@@ -133,13 +138,90 @@ class System(object):
         self.e_clear()
         self._p_restore()
         self.setup()
+        self.ops_reset()
+
+    def snapshot(self, path=None):
+        """
+        Take a snapshot of the current numerical state for restoring later.
+
+        The snapshot contains copies of the DAE arrays, Jacobians, model parameters, services,
+        discrete flags and the routine stepping states. It can be restored with ``System.restore``
+        to branch what-if simulations from the same point without re-running the prefix.
+
+        Parameters
+        ----------
+        path : str, optional
+            path to save the snapshot to disk
+
+        Returns
+        -------
+        Snapshot
+            The snapshot object
+        """
+        snap = Snapshot(t=self.dae.t,
+                        dae=self.dae.get_state(),
+                        system=OrderedDict((('switch_times', np.array(self.switch_times)), )),
+                        )
+        for name, mdl in self.models.items():
+            snap.models[name] = mdl.get_state()
+        for name, routine in self.programs.items():
+            snap.routines[name] = routine.get_state()
+            snap.cache[f'{name}.F'] = routine.solver.F
+
+        snap.cache['ts'] = self.dae.ts
+
+        if path is not None:
+            snap.save(path)
+        return snap
+
+    def restore(self, snap):
+        """
+        Restore the numerical state from a snapshot.
+
+        If the snapshot was taken during a time-domain simulation and TDS has not been set up
+        in this system (e.g., restoring from disk into a freshly loaded case),
+        the addresses and storage for TDS models will be set up first.
+
+        Stored time series after the snapshot are discarded if the snapshot was taken in
+        this process. Call ``TDS.run(resume=True)`` to continue the simulation.
+
+        Parameters
+        ----------
+        snap : Snapshot or str
+            Snapshot object or the path to a saved snapshot
+
+        Raises
+        ------
+        ValueError
+            If the snapshot does not match the size of the system.
+        """
+        if isinstance(snap, str):
+            snap = Snapshot.load(snap)
+
+        if (snap.dae['m'], snap.dae['n']) != (self.dae.m, self.dae.n) and 'TDS' in snap.routines:
+            self.TDS._setup()
+
+        self.dae.set_state(snap.dae)
+        for name, state in snap.models.items():
+            self.import_model(name).set_state(state)
+        for name, state in snap.routines.items():
+            routine = self.programs[name]
+            routine.set_state(state)
+            routine.solver.F = snap.cache.get(f'{name}.F')
+            routine.solver.factorize = routine.solver.F is None
+
+        self.switch_times = np.array(snap.system['switch_times'])
+        self.vars_to_models()
+
+        if snap.cache.get('ts') is self.dae.ts:
+            self.dae.ts.truncate(snap.dae['ts_len'])
 
     def add(self, model, param_dict=None, **kwargs):
-        if model not in self.models:
+        if model not in self._model_files:
             logger.warning(f"<{model}> is not an existing model.")
             return
-        group_name = self.__dict__[model].group
-        group = self.groups[group_name]
+        mdl = self.import_model(model)
+        group = self.groups[mdl.group]
 
         if param_dict is None:
             param_dict = {}
@@ -148,8 +230,41 @@ class System(object):
 
         idx = param_dict.pop('idx', None)
         idx = group.get_next_idx(idx=idx, model_name=model)
-        self.__dict__[model].add(idx=idx, **param_dict)
-        group.add(idx=idx, model=self.__dict__[model])
+        mdl.add(idx=idx, **param_dict)
+        group.add(idx=idx, model=mdl)
+
+    def add_many(self, model, columns=None, **kwargs):
+        """
+        Add multiple devices to a model using columns of parameters.
+
+        This is the columnar counterpart of ``System.add``. Parameter checks are performed on arrays,
+        and the idx are registered to the group in bulk.
+
+        Parameters
+        ----------
+        model : str
+            Model name
+        columns : dict or pandas.DataFrame, optional
+            Parameter columns keyed by parameter names. The optional ``idx`` column holds the device idx.
+        kwargs : array-like
+            Additional parameter columns
+        """
+        if model not in self._model_files:
+            logger.warning(f"<{model}> is not an existing model.")
+            return
+        mdl = self.import_model(model)
+        group = self.groups[mdl.group]
+
+        columns = OrderedDict() if columns is None else OrderedDict(columns.items())
+        columns.update(kwargs)
+        if len(columns) == 0:
+            return
+
+        n = len(next(iter(columns.values())))
+        idx = columns.pop('idx', None)
+        idx = group.get_next_idx_batch(idx=idx, n=n, model_name=model)
+        mdl.add_batch(idx, **columns)
+        group.add_batch(idx, mdl)
 
     def set_address(self, models=None):
         if models is None:
@@ -191,8 +306,8 @@ class System(object):
             for name, instance in mdl.cache.vars_ext.items():
                 ext_name = instance.model
                 try:
-                    ext_model = self.__dict__[ext_name]
-                except KeyError:
+                    ext_model = getattr(self, ext_name)
+                except AttributeError:
                     raise KeyError(f'<{ext_name}> is not a model or group name.')
 
                 instance.link_external(ext_model)
@@ -246,8 +361,8 @@ class System(object):
             for instance in mdl.services_ext.values():
                 ext_name = instance.model
                 try:
-                    ext_model = self.__dict__[ext_name]
-                except KeyError:
+                    ext_model = getattr(self, ext_name)
+                except AttributeError:
                     raise KeyError(f'<{ext_name}> is not a model or group name.')
 
                 instance.link_external(ext_model)
@@ -287,29 +402,53 @@ class System(object):
                 if isinstance(item, AntiWindupLimiter):
                     self.antiwindups.append(item)
 
-    def calc_pu_coeff(self):
+    def link_ext_param(self):
         """
-        Calculate per unit conversion factor; store input parameters to `vin`, and perform the conversion
-        Returns
-        -------
+        Retrieve the values of `ExtParam` of all models from the parent models or groups.
 
+        The idx of each indexer are looked up once per parent and shared by the `ExtParam` instances
+        using the same indexer.
         """
-        Sb = self.config.mva
+        uids = {}  # (parent name, id of indexer): uid from `idx2uid` or `idx2mid_uid`
 
         for mdl in self.models.values():
-            # get external parameters with `link_external` and then calculate the pu coeff
             for instance in mdl.params_ext.values():
                 ext_name = instance.model
                 try:
-                    ext_model = self.__dict__[ext_name]
-                except KeyError:
+                    ext_model = getattr(self, ext_name)
+                except AttributeError:
                     raise KeyError(f'<{ext_name}> is not a model or group name.')
 
                 try:
-                    instance.link_external(ext_model)
+                    key = (ext_name, id(instance.indexer))
+                    if key not in uids and instance.indexer is not None:
+                        idx = instance.indexer_idx
+                        if isinstance(ext_model, GroupBase):
+                            uids[key] = ext_model.idx2mid_uid(idx)
+                        elif len(idx) > 0:
+                            uids[key] = ext_model.idx2uid(idx)
+                    instance.link_external(ext_model, uid=uids.get(key))
                 except IndexError:
                     raise IndexError(f'Model <{mdl.class_name}> param <{instance.name}> link parameter error')
 
+    def calc_pu_coeff(self):
+        """
+        Calculate per unit conversion factor; store input parameters to `vin`, and perform the conversion
+
+        External parameters are linked with ``link_ext_param`` before the conversion.
+
+        Returns
+        -------
+
+        """
+        Sb = self.config.mva
+
+        self.link_ext_param()
+
+        for mdl in self.models.values():
+            if mdl.n == 0:
+                continue
+
             # default Sn to Sb if not provided. Some controllers might not have Sn or Vn.
             if 'Sn' in mdl.params:
                 Sn = mdl.Sn.v
@@ -355,9 +494,10 @@ class System(object):
                       'g': Rb / Rn,
                       }
 
-            for prop, coeff in coeffs.items():
-                for p in mdl.find_param(prop).values():
-                    p.set_pu_coeff(coeff)
+            for p in mdl.num_params.values():
+                for prop, coeff in coeffs.items():
+                    if p.get_property(prop) is True:
+                        p.set_pu_coeff(coeff)
 
     def l_update_var(self, models: Optional[Union[str, List, OrderedDict]] = None):
         self._call_models_method('l_update_var', models)
@@ -567,15 +707,26 @@ class System(object):
         return out
 
     def dill_calls(self):
+        """
+        Dump the calls of all models to the pkl file with dill.
+
+        The calls of each model are serialized separately so that ``undill_calls`` can defer loading them.
+        """
         logger.debug("Dumping calls to andes.pkl with dill")
         import dill
         dill.settings['recurse'] = True
 
         pkl_path = get_pkl_path()
         with open(pkl_path, 'wb') as f:
-            dill.dump(self.calls, f)
+            dill.dump(OrderedDict((name, dill.dumps(call)) for name, call in self.calls.items()), f)
 
     def undill_calls(self):
+        """
+        Read the calls of all models from the pkl file without deserializing them.
+
+        The calls of a model are deserialized by ``load_calls`` when the model is imported. Models imported
+        before are loaded here.
+        """
         import dill
         dill.settings['recurse'] = True
 
@@ -585,25 +736,52 @@ class System(object):
             self.prepare()
 
         with open(pkl_path, 'rb') as f:
-            self.calls = dill.load(f)
+            calls = dill.load(f)
         logger.debug(f'System undill: loaded <{pkl_path}> file.')
-        for name, model_call in self.calls.items():
-            self.__dict__[name].calls = model_call
+
+        for name, model_call in calls.items():
+            if isinstance(model_call, bytes):
+                self._dilled_calls[name] = model_call
+            else:
+                # calls dumped as a whole by earlier versions
+                self.calls[name] = model_call
+
+        self.load_calls(self.models)
+
+    def load_calls(self, models=None):
+        """
+        Deserialize the calls of models read by ``undill_calls`` and attach them to the models.
+
+        Parameters
+        ----------
+        models : OrderedDict, optional
+            Models to load calls for. Models with data are loaded if None.
+        """
+        if models is None:
+            models = OrderedDict((name, mdl) for name, mdl in self.models.items() if mdl.n > 0)
+
+        for name, mdl in models.items():
+            if name in self._dilled_calls:
+                import dill
+                self.calls[name] = dill.loads(self._dilled_calls.pop(name))
+                logger.debug(f'Calls of <{name}> loaded.')
+            if name in self.calls:
+                mdl.calls = self.calls[name]
 
     def _get_models(self, models):
         if models is None:
             models = self._models_with_flag['pflow']
         if isinstance(models, str):
-            models = {models: self.__dict__[models]}
+            models = {models: getattr(self, models)}
         elif isinstance(models, Model):
-            models = {models.class_name, models}
+            models = {models.class_name: models}
         elif isinstance(models, list):
-            models = OrderedDict()
-            for item in models:
+            items, models = models, OrderedDict()
+            for item in items:
                 if isinstance(item, Model):
                     models[item.class_name] = item
                 elif isinstance(item, str):
-                    models[item] = self.__dict__[item]
+                    models[item] = getattr(self, item)
                 else:
                     raise TypeError(f'Unknown type {type(item)}')
         # do nothing for OrderedDict type
@@ -644,15 +822,20 @@ class System(object):
         """
         Collect indices into `RefParam` for all models
 
+        The referencing idx are grouped by the uid of the referenced devices with a stable sort, which
+        keeps the order of models and devices. Each `RefParam` gets the concatenated idx in ``flat``,
+        the CSR-style offsets of the devices in ``offsets``, and one list per device in ``v``.
+
         Returns
         -------
 
         """
         # FIXME: too many safe-checking here. Even the model can be non-existent.
 
+        collected = OrderedDict()  # (model, RefParam name): (list of uid arrays, list of idx lists)
         for model in self.models.values():
-            for ref in model.ref_params.values():
-                ref.v = [list() for _ in range(model.n)]
+            for name in model.ref_params:
+                collected[(model, name)] = ([], [])
 
         for model in self.models.values():
             if model.n == 0:
@@ -670,11 +853,24 @@ class System(object):
                     if n not in dest_model.ref_params:
                         continue
 
-                    for model_idx, dest_idx in zip(model.idx, ref.v):
-                        if dest_idx not in dest_model.idx:
-                            continue
-                        uid = dest_model.idx2uid(dest_idx)
-                        dest_model.ref_params[n].v[uid].append(model_idx)
+                    uid = dest_model.get_uid(ref.v, allow_missing=True)
+                    found = uid >= 0
+                    uids, idxes = collected[(dest_model, n)]
+                    uids.append(uid[found])
+                    idxes.append([item for item, f in zip(model.idx, found.tolist()) if f])
+
+        for (model, name), (uids, idxes) in collected.items():
+            uid = np.concatenate(uids + [np.zeros(0, dtype=int)]).astype(int)
+            idx = [item for items in idxes for item in items]
+            flat = [idx[i] for i in np.argsort(uid, kind='stable').tolist()]
+
+            offsets = np.zeros(model.n + 1, dtype=int)
+            offsets[1:] = np.cumsum(np.bincount(uid, minlength=model.n))
+
+            ref = model.ref_params[name]
+            ref.flat = flat
+            ref.offsets = offsets
+            ref.v = [flat[start:end] for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
 
     def _generate_initializers(self):
         # TODO: consider both JIT and non-JIT models
@@ -711,31 +907,88 @@ class System(object):
 
     def _model_import(self):
         """
-        Import and instantiate the non-JIT models and the JIT models.
+        Register the models defined in ``non_jit`` in ``models/__init__.py``.
 
-        Models defined in ``jits`` and ``non_jits`` in ``models/__init__.py``
-        will be imported and instantiated accordingly.
+        Models are imported and instantiated with ``import_model`` on the first access, namely, when a parser
+        adds data or a routine requests the model.
 
         Returns
         -------
         None
         """
-        # non-JIT models
         for file, cls_list in non_jit.items():
             for model_name in cls_list:
-                the_module = importlib.import_module('andes.models.' + file)
-                the_class = getattr(the_module, model_name)
-                self.__dict__[model_name] = the_class(system=self, config=self._config_from_file)
-                self.models[model_name] = self.__dict__[model_name]
+                self._model_files[model_name] = file
 
-                # link to the group
-                group_name = self.__dict__[model_name].group
-                self.__dict__[group_name].add_model(model_name, self.__dict__[model_name])
+    def import_model(self, name):
+        """
+        Import and instantiate a model if not yet, and return the instance.
 
-        # import JIT models
-        # for file, pair in jits.items():
-        #     for cls, name in pair.items():
-        #         self.__dict__[name] = JIT(self, file, cls, name)
+        The instance is stored as an attribute, added to ``self.models`` in the order of ``non_jit``, and linked
+        to its group. A model imported after ``setup`` has its parameters converted to arrays.
+
+        Parameters
+        ----------
+        name : str
+            Model name
+
+        Returns
+        -------
+        Model
+            The model instance
+        """
+        if name in self.models:
+            return self.models[name]
+
+        the_module = importlib.import_module('andes.models.' + self._model_files[name])
+        the_class = getattr(the_module, name)
+        instance = the_class(system=self, config=self._config_from_file)
+        self.__dict__[name] = instance
+
+        # keep the order of `non_jit` so that addresses do not depend on the order of access
+        self.models[name] = instance
+        order = list(self._model_files)
+        for item in order[order.index(name) + 1:]:
+            if item in self.models:
+                self.models.move_to_end(item)
+
+        # link to the group
+        self.groups[instance.group].add_model(name, instance)
+
+        self.load_calls(OrderedDict([(name, instance)]))
+        if self.is_setup:
+            instance.list2array()
+
+        if '_models_with_flag' in self.__dict__:
+            self._update_models_with_flag()
+
+        logger.debug(f'Model <{name}> imported.')
+        return instance
+
+    def import_models(self, names=None):
+        """
+        Import and instantiate models with ``import_model``.
+
+        Parameters
+        ----------
+        names : list, optional
+            Model names. All models are imported if None.
+        """
+        for name in (self._model_files if names is None else names):
+            self.import_model(name)
+
+    def __getattr__(self, name):
+        # called only if `name` is not found as an attribute; import models on the first access.
+        # Check if a model exists with `_model_files` or `models` instead, which imports nothing.
+        if name in self.__dict__.get('_model_files', ()):
+            return self.import_model(name)
+        raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+
+    def _update_models_with_flag(self):
+        self._models_with_flag = {'pflow': self.get_models_with_flag('pflow'),
+                                  'tds': self.get_models_with_flag('tds'),
+                                  'pflow_and_tds': self.get_models_with_flag(('tds', 'pflow')),
+                                  }
 
     def _routine_import(self):
         """
@@ -781,6 +1034,17 @@ class System(object):
         for instance in models.values():
             instance.switch_action(self.dae.t)
 
+    def ops_reset(self, models=None):
+        """
+        Clear the stored values of ``OperationService`` so that they are recomputed after the inputs change.
+
+        Parameters
+        ----------
+        models : OrderedDict, optional
+            Models to reset. All models if None.
+        """
+        self._call_models_method('ops_reset', self.models if models is None else models)
+
     def _p_restore(self):
         """
         Restore parameters stored in `pin`
@@ -824,6 +1088,8 @@ class System(object):
         dict
             a dict containing the config from devices; class names are the keys
         """
+        self.import_models()
+
         config_dict = configparser.ConfigParser()
         config_dict[self.__class__.__name__] = self.config.as_dict()
 
@@ -12,3 +12,43 @@ def list_flatten(input_list):
         return functools.reduce(operator.iconcat, input_list, [])
     else:
         return input_list
+
+
+def sorted_index(keys):
+    """
+    Build a sorted index of unique keys for ``index_lookup``.
+
+    Returns
+    -------
+    tuple or None
+        ``(sorted keys, positions of the sorted keys)``, or None if the keys are not all numbers or all str
+    """
+    types = set(map(type, keys))
+    if len(types) != 1 or not issubclass(types.pop(), (int, float, str, np.number)):
+        return None
+    keys = np.asarray(keys)
+    order = np.argsort(keys, kind='stable')
+    return keys[order], order
+
+
+def index_lookup(index, query):
+    """
+    Look up the positions of a list of keys in an index from ``sorted_index``.
+
+    Returns
+    -------
+    np.ndarray or None
+        Positions of the keys with -1 for keys not found, or None if the query type does not match the index
+    """
+    keys, order = index
+    query = np.asarray(query)
+    if len(query) == 0:
+        return np.zeros(0, dtype=int)
+    if not ((keys.dtype.kind in 'biuf' and query.dtype.kind in 'biuf') or
+            (keys.dtype.kind == 'U' and query.dtype.kind == 'U')):
+        return None
+    if len(keys) == 0:
+        return np.full(len(query), -1, dtype=int)
+
+    pos = np.minimum(np.searchsorted(keys, query), len(keys) - 1)
+    return np.where(keys[pos] == query, order[pos], -1)
@@ -165,6 +165,23 @@ def get_pkl_path():
     return pkl_path
 
 
+def get_cache_dir():
+    """
+    Get the directory for cached case data.
+
+    Returns
+    -------
+    str
+        Path to ``~/.andes/cache``
+    """
+    cache_path = os.path.join(str(pathlib.Path.home()), '.andes', 'cache')
+
+    if not os.path.exists(cache_path):
+        os.makedirs(cache_path)
+
+    return cache_path
+
+
 def get_log_dir():
     """
     Get the directory for log file.
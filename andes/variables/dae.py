@@ -1,42 +1,216 @@
 import logging
 from collections import OrderedDict
 from andes.shared import pd, np, spmatrix
+from andes.variables.snapshot import sparse_to_ijv, ijv_to_sparse
 
 logger = logging.getLogger(__name__)
 
 
 class DAETimeSeries(object):
-    def __init__(self, dae=None):
+    """
+    DAE time series data stored in preallocated arrays.
+
+    Time is stored in a 1-D float64 array, and the values of [x, y] and z are stored in 2-D arrays with one
+    row per time step. Rows are allocated in chunks so that appending is amortized constant time.
+    ``t``, ``xy`` and ``z`` are views into the buffers without copying.
+
+    The dtypes of ``xy`` and ``z`` can be reduced, e.g., to ``float32`` and ``uint8``, to save memory.
+
+    Indexing with ``ts[rows, cols]`` returns the columns of the concatenated ``[t, x, y, z]`` array
+    without building it. ``df`` and ``df_z`` are built once and cached until the stored steps change.
+
+    Parameters
+    ----------
+    dae : DAE
+        the DAE instance for variable names
+    chunk : int
+        the minimum number of rows to allocate at a time
+    dtype : type
+        dtype for storing the values of [x, y]
+    z_dtype : type
+        dtype for storing the values of z
+    """
+    def __init__(self, dae=None, chunk=1024, dtype=np.float64, z_dtype=np.float64):
         self.dae = dae
-        self._data = OrderedDict()
-        self._z = OrderedDict()
+        self.chunk = chunk
+        self.dtype = dtype
+        self.z_dtype = z_dtype
+
+        self._n = 0  # number of stored steps
+        self._t = np.empty(0)
+        self._xy = np.empty((0, 0), dtype=dtype)
+        self._z = np.empty((0, 0), dtype=z_dtype)
+
+        self._xy_idx = None
+        self._df = None
+        self._df_z = None
+
+    def __len__(self):
+        return self._n
 
-        self.t = np.array([])
-        self.xy = np.array([])
-        self.z = np.array([])
-        self.df = None
-        self.df_z = None
+    @property
+    def t(self):
+        """Return the time steps as a view."""
+        return self._t[:self._n]
+
+    @property
+    def xy(self):
+        """Return the values of [x, y] as a view with one row per step."""
+        return self._xy[:self._n]
+
+    @property
+    def z(self):
+        """Return the values of z as a view with one row per step."""
+        return self._z[:self._n]
+
+    @property
+    def shape(self):
+        """Return the shape of the concatenated [t, x, y, z] array."""
+        return self._n, 1 + self._xy.shape[1] + self._z.shape[1]
 
     @property
     def txyz(self):
         """
-        Return the values of [t, x, y, z] in an array.
+        Return the values of [t, x, y, z] in a float64 array.
+
+        The returned array is a new copy built on every access, which costs a full pass over the stored data.
+        Keep the result instead of reading it in loops, or use ``t``, ``xy`` and ``z`` for views.
         """
-        self.df = pd.DataFrame.from_dict(self._data, orient='index', columns=self.dae.xy_name)
-        self.t = self.df.index.to_numpy()
-        self.xy = self.df.to_numpy()
+        return np.hstack((self.t.reshape((-1, 1)), self.xy, self.z)).astype(np.float64, copy=False)
+
+    def _column(self, i):
+        nxy = self._xy.shape[1]
+        if i == 0:
+            return self.t
+        elif i <= nxy:
+            return self.xy[:, i - 1]
+        return self.z[:, i - 1 - nxy]
+
+    def __getitem__(self, key):
+        rows, cols = key
+        ncol = self.shape[1]
+        if isinstance(cols, (int, np.integer)):
+            return self._column(int(cols) % ncol)[rows]
+        if isinstance(cols, slice):
+            cols = range(*cols.indices(ncol))
+        cols = [int(i) % ncol for i in np.ravel(cols)]
+        if len(cols) == 0:
+            return np.empty((self._n, 0))[rows]
+        return np.column_stack([self._column(i) for i in cols])[rows]
 
-        if len(self._z):
-            self.df_z = pd.DataFrame.from_dict(self._z, orient='index', columns=self.dae.z_name)
-            self.z = self.df_z.to_numpy()
-            return np.hstack((self.t.reshape((-1, 1)), self.xy, self.z))
-        else:
-            return np.hstack((self.t.reshape((-1, 1)), self.xy))
+    @property
+    def xy_idx(self):
+        """Return the indices into [x, y] of the recorded variables, or None for all."""
+        return self._xy_idx
+
+    @xy_idx.setter
+    def xy_idx(self, value):
+        self._xy_idx = value
+        self._clear_df()
+
+    def _clear_df(self):
+        """
+        Discard the cached DataFrames after the stored steps change.
+        """
+        self._df = None
+        self._df_z = None
+
+    @property
+    def xy_name(self):
+        """Return the names of the recorded [x, y] variables."""
+        if self.xy_idx is None:
+            return self.dae.xy_name
+        names = self.dae.xy_name
+        return [names[i] for i in self.xy_idx]
+
+    @property
+    def xy_tex_name(self):
+        """Return the LaTeX names of the recorded [x, y] variables."""
+        if self.xy_idx is None:
+            return self.dae.xy_tex_name
+        names = self.dae.xy_tex_name
+        return [names[i] for i in self.xy_idx]
+
+    @property
+    def df(self):
+        """Return the xy time series in a DataFrame indexed by time, cached until the stored steps change."""
+        if self._df is None:
+            self._df = pd.DataFrame(self.xy, index=self.t, columns=self.xy_name)
+        return self._df
+
+    @property
+    def df_z(self):
+        """Return the z time series in a DataFrame indexed by time, cached until the stored steps change."""
+        if self._df_z is None:
+            self._df_z = pd.DataFrame(self.z, index=self.t, columns=self.dae.z_name)
+        return self._df_z
+
+    def _grow(self):
+        """
+        Reallocate the buffers with at least one more chunk of rows.
+        """
+        nrow = len(self._t) + max(self.chunk, len(self._t))
+        t = np.empty(nrow)
+        xy = np.empty((nrow, self._xy.shape[1]), dtype=self.dtype)
+        z = np.empty((nrow, self._z.shape[1]), dtype=self.z_dtype)
+        t[:self._n] = self.t
+        xy[:self._n] = self.xy
+        z[:self._n] = self.z
+        self._t, self._xy, self._z = t, xy, z
 
     def store_txyz(self, t, xy, z=None):
-        self._data[t] = xy
-        if z is not None:
-            self._z[t] = z
+        """
+        Append the values of a time step.
+
+        Parameters
+        ----------
+        t : float
+            simulation time
+        xy : np.ndarray
+            values of [x, y]
+        z : np.ndarray, optional
+            values of discrete flags
+        """
+        nz = 0 if z is None else len(z)
+        if self._n == 0:
+            self.set_arrays(np.empty(0), np.empty((0, len(xy))), np.empty((0, nz)))
+        if self._n >= len(self._t):
+            self._grow()
+
+        self._t[self._n] = t
+        self._xy[self._n] = xy
+        if nz:
+            self._z[self._n] = z
+        self._n += 1
+        self._clear_df()
+
+    def set_arrays(self, t, xy, z=None):
+        """
+        Replace the stored time series with the given arrays, which are converted to the storage dtypes.
+        """
+        self._t = np.array(t, dtype=np.float64)
+        self._xy = np.array(xy, dtype=self.dtype, ndmin=2)
+        self._z = np.empty((len(self._t), 0), dtype=self.z_dtype) if z is None else \
+            np.array(z, dtype=self.z_dtype, ndmin=2)
+        self._n = len(self._t)
+        self._clear_df()
+
+    def detach(self):
+        """
+        Return the stored rows of [t, x, y, z] in a float64 array and start over with empty buffers.
+        """
+        data = self.txyz
+        self.set_arrays(np.empty(0), np.empty((0, self._xy.shape[1])), np.empty((0, self._z.shape[1])))
+        return data
+
+    def truncate(self, n):
+        """
+        Keep only the first ``n`` stored time steps.
+
+        Used when restoring a snapshot to discard the steps simulated after it.
+        """
+        self._n = min(n, self._n)
+        self._clear_df()
 
 
 class DAE(object):
@@ -84,6 +258,44 @@ class DAE(object):
     def clear_ts(self):
         self.ts = DAETimeSeries(self)
 
+    def get_state(self):
+        """
+        Return copies of the numerical arrays and Jacobians in an OrderedDict.
+        """
+        state = OrderedDict()
+        state['t'] = self.t
+        state['m'], state['n'], state['o'] = self.m, self.n, self.o
+        for name in ('x', 'y', 'z', 'f', 'g'):
+            state[name] = np.array(self.__dict__[name])
+        for name in self.jac_name:
+            state[name] = sparse_to_ijv(self.__dict__[name])
+        state['ts_len'] = len(self.ts)
+        return state
+
+    def set_state(self, state):
+        """
+        Restore the arrays and Jacobians from ``state`` returned by ``get_state``.
+
+        The arrays ``x``, ``y``, ``z``, ``f`` and ``g`` are restored in place if their sizes are unchanged.
+
+        Raises
+        ------
+        ValueError
+            If the sizes of the state do not match the current DAE.
+        """
+        if (state['m'], state['n']) != (self.m, self.n):
+            raise ValueError(f"DAE size mismatch: state has m={state['m']}, n={state['n']}, "
+                             f"current m={self.m}, n={self.n}.")
+        self.t = state['t']
+        for name in ('x', 'y', 'z', 'f', 'g'):
+            # copy into the arrays in place to keep the references held elsewhere valid
+            if self.__dict__[name].shape == state[name].shape:
+                self.__dict__[name][:] = state[name]
+            else:
+                self.__dict__[name] = np.array(state[name])
+        for name in self.jac_name:
+            self.__dict__[name] = ijv_to_sparse(state[name])
+
     def clear_array(self):
         """
         Reset equation and variable arrays to empty.
@@ -324,7 +536,7 @@ class DAE(object):
 
     def write_lst(self, lst_path):
         """
-        Dump the variable name lst file
+        Dump the variable name lst file for the recorded variables
         :return: succeed flag
         """
 
@@ -334,12 +546,12 @@ class DAE(object):
         # header line
         out += template.format(0, 'Time [s]', '$Time\\ [s]$')
 
-        # output variable indices
-        idx = list(range(self.m + self.n + self.o))
+        # variable names of the recorded time series concatenated
+        uname = self.ts.xy_name + self.z_name
+        fname = self.ts.xy_tex_name + self.z_tex_name
 
-        # variable names concatenated
-        uname = self.xyz_name
-        fname = self.xyz_tex_name
+        # output variable indices
+        idx = list(range(len(uname)))
 
         for e, i in enumerate(idx):
             # `idx` in the lst file is always consecutive
@@ -350,4 +562,38 @@ class DAE(object):
         return True
 
     def write_npy(self, npy_path):
-        np.save(npy_path, self.ts.txyz)
+        """
+        Save the time series of [t, x, y, z] to a npy file in float64.
+        """
+        ts = self.ts
+        nxy = ts.xy.shape[1]
+        out = np.lib.format.open_memmap(npy_path, mode='w+', dtype=np.float64, shape=ts.shape)
+        out[:, 0] = ts.t
+        out[:, 1:1 + nxy] = ts.xy
+        out[:, 1 + nxy:] = ts.z
+        out.flush()
+        del out
+
+    def write_npz(self, npz_path, compress=True):
+        """
+        Save the time series to a npz file with arrays ``t``, ``xy`` and ``z`` in the storage dtypes.
+
+        Flags in ``z`` stored as ``uint8`` are packed into bits in ``z_bits`` with the number of columns in ``nz``.
+
+        Parameters
+        ----------
+        npz_path : str
+            path to the npz file
+        compress : bool
+            True to compress the arrays
+        """
+        ts = self.ts
+        arrays = dict(t=ts.t, xy=ts.xy)
+        if ts.z.dtype == np.uint8:
+            arrays['z_bits'] = np.packbits(ts.z, axis=1)
+            arrays['nz'] = np.array(ts.z.shape[1])
+        else:
+            arrays['z'] = ts.z
+
+        save = np.savez_compressed if compress else np.savez
+        save(npz_path, **arrays)
@@ -131,7 +131,7 @@ class Report(object):
 
             # ----------------------------------------
             # Node data
-            if hasattr(system, 'Node') and system.Node.n:
+            if 'Node' in system.models and system.Node.n:
                 text.append(['NODE DATA:\n'])
                 header.append(['V(pu)'])
                 row_name.append(system.Node.name.v)
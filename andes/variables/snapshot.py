@@ -0,0 +1,122 @@
+"""
+Snapshot of the numerical state of a system for checkpointing and branching
+"""
+
+import logging
+import pickle
+from collections import OrderedDict
+
+from andes.shared import np, spmatrix
+
+logger = logging.getLogger(__name__)
+
+
+class Snapshot(object):
+    """
+    A checkpoint of the numerical state of a ``System``.
+
+    A snapshot holds copies of the DAE arrays and Jacobians, the evolving values of each model
+    (numerical parameters, services and discrete flags) and the stepping state of routines.
+    It does not hold the case data structure, which is expected to be identical when restoring.
+
+    Objects that only live in the current process, such as the cached symbolic factorization
+    of the TDS solver and the time series storage, are kept in ``cache`` and are not written
+    to disk by ``save``.
+
+    Attributes
+    ----------
+    t : float
+        Simulation time when the snapshot was taken
+    dae : OrderedDict
+        Copies of the DAE arrays and Jacobian triplets
+    models : OrderedDict
+        ``{model name: state dict}`` from ``Model.get_state``
+    routines : OrderedDict
+        ``{routine name: state dict}`` from the routine ``get_state``
+    system : OrderedDict
+        System-level arrays, e.g., ``switch_times``
+    cache : dict
+        In-memory only objects to speed up restoring in the same process
+    """
+
+    _fields = ('t', 'dae', 'models', 'routines', 'system')
+
+    def __init__(self, t=0.0, dae=None, models=None, routines=None, system=None):
+        self.t = t
+        self.dae = OrderedDict() if dae is None else dae
+        self.models = OrderedDict() if models is None else models
+        self.routines = OrderedDict() if routines is None else routines
+        self.system = OrderedDict() if system is None else system
+        self.cache = dict()
+
+    def save(self, path):
+        """
+        Save the snapshot to ``path`` with pickle. In-memory cache is excluded.
+
+        Parameters
+        ----------
+        path : str
+            path to the output file
+        """
+        data = OrderedDict((name, getattr(self, name)) for name in self._fields)
+        with open(path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        logger.debug(f'Snapshot at t={self.t:.6g} saved to <{path}>.')
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a snapshot saved by ``Snapshot.save``.
+
+        Parameters
+        ----------
+        path : str
+            path to the snapshot file
+
+        Returns
+        -------
+        Snapshot
+            the loaded snapshot
+        """
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+        return cls(**data)
+
+
+def sparse_to_ijv(mat):
+    """
+    Convert a ``cvxopt.spmatrix`` into a tuple of ``(I, J, V, size)`` with NumPy arrays.
+
+    Returns ``None`` if ``mat`` is ``None``.
+    """
+    if mat is None:
+        return None
+    return (np.array(mat.I, dtype=int).ravel(),
+            np.array(mat.J, dtype=int).ravel(),
+            np.array(mat.V, dtype=float).ravel(),
+            tuple(mat.size))
+
+
+def ijv_to_sparse(ijv):
+    """
+    Build a ``cvxopt.spmatrix`` from a tuple created by ``sparse_to_ijv``.
+    """
+    if ijv is None:
+        return None
+    i, j, v, size = ijv
+    return spmatrix(v.tolist(), i.tolist(), j.tolist(), size, 'd')
+
+
+def copy_into(obj, attr, value):
+    """
+    Restore ``value`` to ``obj.<attr>``, in place if the current array has the same shape.
+
+    Arrays in models are referenced by the cached inputs and should keep their addresses.
+    Otherwise, a copy is assigned and the cached inputs need to be refreshed.
+    """
+    current = getattr(obj, attr)
+    if isinstance(current, np.ndarray) and np.shape(current) == np.shape(value) \
+            and current.dtype == np.asarray(value).dtype:
+        current[:] = value
+    else:
+        setattr(obj, attr, np.array(value))
@@ -0,0 +1,147 @@
+"""
+Streaming writer for saving TDS time series to disk during simulation
+"""
+
+import glob
+import logging
+import os
+import queue
+import threading
+
+from andes.shared import np
+
+logger = logging.getLogger(__name__)
+
+
+def segment_path(npy_path, i):
+    """
+    Return the path of the ``i``-th segment for the output ``npy_path``.
+
+    Segments of ``case_out.npy`` are named ``case_out.0000.npy``, ``case_out.0001.npy``, etc.
+    """
+    name, _ = os.path.splitext(npy_path)
+    return f'{name}.{i:04d}.npy'
+
+
+def find_segments(npy_path):
+    """
+    Return a sorted list of existing segment paths for the output ``npy_path``.
+    """
+    name, _ = os.path.splitext(npy_path)
+    return sorted(glob.glob(glob.escape(name) + '.[0-9][0-9][0-9][0-9].npy'))
+
+
+def load_segments(npy_path):
+    """
+    Load and concatenate the segments for ``npy_path``.
+
+    Returns
+    -------
+    np.ndarray or None
+        The concatenated data, or ``None`` if no segment is found.
+    """
+    paths = find_segments(npy_path)
+    if len(paths) == 0:
+        return None
+    return np.vstack([np.load(path) for path in paths])
+
+
+class StreamWriter(object):
+    """
+    Write chunks of time series data to npy segments in a background thread.
+
+    Chunks are handed over with ``write`` and saved as ``<output>.NNNN.npy`` while the simulation proceeds.
+    The queue size is bounded so that at most ``maxsize`` chunks are held in memory.
+    When closed, the segments are merged into the output npy file and removed.
+    Segments left by an interrupted run can be loaded with ``load_segments``.
+
+    Parameters
+    ----------
+    npy_path : str
+        path to the final npy output
+    maxsize : int
+        maximum number of chunks waiting to be written
+    """
+
+    def __init__(self, npy_path, maxsize=4):
+        self.npy_path = npy_path
+        self.segments = list()
+        self.nrow = 0
+        self.ncol = 0
+        self.error = None
+
+        self._count = 0
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+
+        # remove stale segments from previous runs
+        for path in find_segments(npy_path):
+            os.remove(path)
+
+        self._thread.start()
+
+    def write(self, data):
+        """
+        Queue a chunk of rows for writing. Blocks if the queue is full.
+
+        The writer takes the ownership of ``data``, which should not be modified afterwards.
+        """
+        if len(data) == 0:
+            return
+        if self.error is not None:
+            raise self.error
+
+        path = segment_path(self.npy_path, self._count)
+        self._count += 1
+        self.nrow += data.shape[0]
+        self.ncol = data.shape[1]
+        self._queue.put((path, data))
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            path, data = item
+            try:
+                np.save(path, data)
+                self.segments.append(path)
+            except Exception as e:
+                logger.error(f'Error writing segment <{path}>: {e}')
+                self.error = e
+
+    def close(self, merge=True):
+        """
+        Wait for the queued chunks to be written and optionally merge the segments.
+
+        Parameters
+        ----------
+        merge : bool
+            True to merge the segments into ``npy_path`` and remove them
+
+        Returns
+        -------
+        bool
+            True if the segments are merged
+        """
+        self._queue.put(None)
+        self._thread.join()
+
+        if (not merge) or (self.error is not None):
+            return False
+
+        out = np.lib.format.open_memmap(self.npy_path, mode='w+', dtype=np.float64,
+                                        shape=(self.nrow, self.ncol))
+        row = 0
+        for path in self.segments:
+            data = np.load(path, mmap_mode='r')
+            out[row:row + data.shape[0]] = data
+            row += data.shape[0]
+            del data
+        out.flush()
+        del out
+
+        for path in self.segments:
+            os.remove(path)
+        self.segments = list()
+        return True
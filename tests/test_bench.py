@@ -0,0 +1,25 @@
+import unittest
+
+from andes import bench
+from andes.utils.paths import get_case
+
+
+class TestBench(unittest.TestCase):
+    def test_profile_case(self):
+        out = bench.profile_case(get_case(bench.cases['ieee14']))
+        self.assertEqual(list(out), ['system', 'undill', 'parse', 'setup'])
+        self.assertTrue(all(val > 0 for val in out.values()))
+
+    def test_check(self):
+        results = {'import': 0.5, 'kundur.setup': 0.1}
+        budgets = {'import': 0.4, 'kundur.setup': 0.2, 'help': 0.1}
+        self.assertEqual(bench.check(results, budgets), [('import', 0.5, 0.4)])
+
+    def test_default_budgets(self):
+        budgets = bench.load_budgets()
+        stages = ['system', 'undill', 'parse', 'setup']
+        expected = ['import', 'help'] + [f'{name}.{stage}' for name in bench.cases for stage in stages]
+        self.assertEqual(sorted(budgets), sorted(expected))
+
+        results = bench.run(['ieee14'], repeat=1)
+        self.assertEqual(bench.check(results, budgets), [])
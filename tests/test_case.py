@@ -1,6 +1,10 @@
+import os
+import tempfile
 import unittest
+import numpy as np
 from andes.system import System
-from andes.io import xlsx
+from andes.io import xlsx, cache, psse, matpower
+from andes.shared import pd
 from andes.utils.paths import get_case
 
 
@@ -30,6 +34,50 @@ class Test5Bus(unittest.TestCase):
         self.assertSequenceEqual(self.ss.Bus.idx, [0, 1, 2, 3, 4])
         self.assertSequenceEqual(self.ss.Area.idx, [1, 2, 3])
 
+        np.testing.assert_array_equal(self.ss.Bus.idx2uid(np.array([4, 0, 2])), [4, 0, 2])
+        self.assertRaises(KeyError, self.ss.Bus.idx2uid, [0, 5])
+
+    def test_lazy_models(self):
+        self.assertNotIn('GENROU', self.ss.models)
+        self.assertEqual(self.ss.GENROU.n, 0)
+        self.assertIn('GENROU', self.ss.groups['SynGen'].models)
+
+        order = list(self.ss._model_files)
+        self.assertEqual(list(self.ss.models), sorted(self.ss.models, key=order.index))
+        self.assertRaises(AttributeError, getattr, self.ss, 'NotAModel')
+
+        # calls are loaded for imported models only, including those imported after setup
+        self.assertIs(self.ss.PQ.calls, self.ss.calls['PQ'])
+        self.assertNotIn('PQ', self.ss._dilled_calls)
+        self.assertIs(self.ss.GENROU.calls, self.ss.calls['GENROU'])
+        self.assertIn('TGOV1', self.ss._dilled_calls)
+
+    def test_report_lazy(self):
+        import andes
+        with tempfile.TemporaryDirectory() as tmp:
+            ss = andes.load(get_case('5bus/pjm5bus.xlsx'), output_path=tmp)
+            ss.PFlow.run()
+            self.assertTrue(os.path.isfile(ss.files.output))
+        # the report checks for optional models without importing them
+        self.assertNotIn('Node', ss.models)
+
+    def test_group_get_set(self):
+        group = self.ss.groups['StaticGen']
+        idx = [3, 0, 4, 3]
+        np.testing.assert_array_equal(group.get('u', idx), [1, 1, 1, 1])
+
+        group.set('u', [3, 4], 'v', [0, 0])
+        self.assertEqual(self.ss.Slack.u.v[0], 0)
+        self.assertEqual(self.ss.PV.u.v[2], 0)
+        self.assertEqual(group.get('name', idx)[1], self.ss.PV.name.v[0])
+        self.assertRaises(KeyError, group.get, 'u', [1])
+
+        # groups locate the model of each idx besides the uid
+        mid, uid = group.idx2mid_uid(idx)
+        self.assertEqual([group._index_models[k].class_name for k in mid], ['Slack', 'PV', 'PV', 'Slack'])
+        self.assertEqual(uid.tolist(), [self.ss.Slack.uid[3], self.ss.PV.uid[0], self.ss.PV.uid[4], 0])
+        self.assertFalse(hasattr(group, 'idx2uid'))
+
     def test_pflow(self):
         self.ss.PFlow.run()
         self.ss.PFlow.newton_krylov()
@@ -52,3 +100,198 @@ class TestKundur2Area(unittest.TestCase):
     def test_tds_init(self):
         self.ss.PFlow.run()
         self.ss.TDS.run([0, 20])
+
+    def test_tds_snapshot(self):
+        self.ss.files.no_output = True
+        self.ss.PFlow.run()
+        self.ss.TDS.config.tf = 1.5
+        self.ss.TDS.run()
+        snap = self.ss.snapshot()
+
+        self.ss.TDS.config.tf = 3.0
+        self.ss.TDS.run(resume=True)
+        xy = np.array(self.ss.dae.xy)
+        n_steps = len(self.ss.dae.ts)
+
+        self.ss.restore(snap)
+        self.assertEqual(self.ss.dae.t, 1.5)
+        self.ss.TDS.run(resume=True)
+        np.testing.assert_array_almost_equal(self.ss.dae.xy, xy)
+        self.assertEqual(len(self.ss.dae.ts), n_steps)
+
+    def test_tds_snapshot_restore(self):
+        self.ss.files.no_output = True
+        self.ss.PFlow.run()
+        self.ss.TDS.config.tf = 1.0
+        self.ss.TDS.run()
+        self.assertEqual(self.ss.GENCLS.n, 0)  # loaded in this system only
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'kundur.snap')
+            self.ss.snapshot(path)
+            xy = np.array(self.ss.dae.xy)
+
+            # the arrays are restored in place
+            x = self.ss.dae.x
+            self.ss.dae.x[:] = 0
+            self.ss.restore(path)
+            self.assertIs(self.ss.dae.x, x)
+            np.testing.assert_array_equal(self.ss.dae.xy, xy)
+
+            ss = System()
+            ss.undill_calls()
+            xlsx.read(ss, get_case('kundur/kundur_full.xlsx'))
+            ss.setup()
+            self.assertNotIn('GENCLS', ss.models)
+            ss.restore(path)
+        np.testing.assert_array_equal(ss.dae.xy, xy)
+
+    def test_tds_record(self):
+        self.ss.files.no_output = True
+        self.ss.PFlow.run()
+        self.ss.TDS.config.tf = 0.5
+        self.ss.TDS.set_record(['GENROU omega', 'Bus v'])
+        self.ss.TDS.run()
+
+        n_vars = self.ss.GENROU.n + self.ss.Bus.n
+        self.assertEqual(self.ss.dae.ts.xy.shape[1], n_vars)
+        self.assertEqual(self.ss.dae.ts.xy_name[0], 'GENROU omega 0')
+        np.testing.assert_array_equal(self.ss.dae.ts.xy[-1, -self.ss.Bus.n:], self.ss.Bus.v.v)
+
+    def test_ref_param(self):
+        ref = self.ss.Area.Bus
+        self.assertEqual(ref.offsets.tolist(), np.cumsum([0] + [len(item) for item in ref.v]).tolist())
+        self.assertEqual(ref.flat, [item for items in ref.v for item in items])
+        for area, buses in zip(self.ss.Area.idx, ref.v):
+            self.assertEqual(buses, [bus for bus, a in zip(self.ss.Bus.idx, self.ss.Bus.area.v) if a == area])
+
+        Vn = [np.sum([self.ss.Bus.Vn.v[self.ss.Bus.uid[bus]] for bus in buses]) for buses in ref.v]
+        np.testing.assert_array_almost_equal(self.ss.Area.Vn_sum.v, Vn)
+        np.testing.assert_array_almost_equal(self.ss.Area.Vn_sum_rep.v, np.repeat(Vn, np.diff(ref.offsets)))
+
+    def test_ops_reset(self):
+        self.assertIsNotNone(self.ss.Area.Vn_sum.v)
+        self.ss.Bus.Vn.vin[0] += 100
+        self.ss.reset()
+
+        Vn = [np.sum([self.ss.Bus.Vn.v[self.ss.Bus.uid[bus]] for bus in buses]) for buses in self.ss.Area.Bus.v]
+        np.testing.assert_array_almost_equal(self.ss.Area.Vn_sum.v, Vn)
+        np.testing.assert_array_almost_equal(self.ss.Area.Vn_sum_rep.v,
+                                             np.repeat(Vn, np.diff(self.ss.Area.Bus.offsets)))
+
+        # values computed from the inputs changed in place are refreshed after a reset
+        self.ss.Area.Vn.v[:] = 1
+        self.ss.ops_reset([self.ss.Area])
+        np.testing.assert_array_equal(self.ss.Area.Vn_sum.v, np.diff(self.ss.Area.Bus.offsets))
+
+    def test_case_cache(self):
+        ss = System()
+        ss.undill_calls()
+        xlsx.read(ss, get_case('kundur/kundur_full.xlsx'))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'kundur.npz')
+            self.assertTrue(cache.write(ss, path))
+
+            # columns are stored natively or in the metadata without pickled objects
+            with np.load(path, allow_pickle=False) as data:
+                self.assertTrue(all(data[key].dtype != object for key in data.files))
+
+            cached = System()
+            cached.undill_calls()
+            self.assertTrue(cache.read(cached, path))
+        cached.setup()
+
+        self.assertEqual(cached.GENROU.idx, self.ss.GENROU.idx)
+        self.assertEqual(cached.PV.busr.v, ss.PV.busr.v)
+        np.testing.assert_array_equal(cached.Bus.idx2uid(cached.Bus.idx[::-1]), np.arange(cached.Bus.n)[::-1])
+        _, uid = cached.groups['StaticGen'].idx2mid_uid(cached.PV.idx)
+        self.assertEqual(uid.tolist(), list(range(cached.PV.n)))
+        self.assertEqual(cached.dae.m, self.ss.dae.m)
+        self.ss.PFlow.run()
+        cached.PFlow.run()
+        np.testing.assert_array_almost_equal(cached.dae.y, self.ss.dae.y)
+
+    def test_case_cache_mva(self):
+        ss = System()
+        ss.undill_calls()
+        self.assertTrue(matpower.read(ss, get_case('matpower/case22.m')))
+        self.assertEqual(ss.mva, 10)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'case22.npz')
+            self.assertTrue(cache.write(ss, path))
+            cached = System()
+            cached.undill_calls()
+            self.assertTrue(cache.read(cached, path))
+
+        self.assertEqual(cached.mva, 10)
+        self.assertEqual(cached.PQ.p0.v, ss.PQ.p0.v)
+
+    def test_add_many(self):
+        ss = System()
+        ss.undill_calls()
+        for name, df in pd.read_excel(get_case('kundur/kundur_full.xlsx'), sheet_name=None, index_col=0).items():
+            ss.add_many(name, df)
+        ss.setup()
+
+        for name, mdl in self.ss.models.items():
+            self.assertEqual(ss.models[name].idx, mdl.idx)
+        self.ss.PFlow.run()
+        ss.PFlow.run()
+        np.testing.assert_array_almost_equal(ss.dae.y, self.ss.dae.y)
+
+
+class TestNPCCRAW(unittest.TestCase):
+    """
+    Test the PSS/E RAW parser with the NPCC 140-bus system
+    """
+    def setUp(self) -> None:
+        self.ss = System()
+        self.ss.undill_calls()
+        psse.read(self.ss, get_case('npcc/npcc48.raw'))
+        self.ss.setup()
+
+    def test_count(self):
+        self.assertEqual(self.ss.Bus.n, 140)
+        self.assertEqual(self.ss.Line.n, 233)
+        self.assertEqual(self.ss.PQ.n, 83)
+        self.assertEqual(self.ss.PV.n + self.ss.Slack.n, 47)
+
+    def test_pflow(self):
+        self.ss.PFlow.run()
+        self.assertTrue(self.ss.PFlow.converged)
+
+    def test_phase_shift(self):
+        with open(get_case('npcc/npcc48.raw'), 'r') as f:
+            lines = f.readlines()
+        # the first two-winding transformer, from bus 1 to 21, with ANG1 of 30 degrees
+        self.assertTrue(lines[486].startswith('1.07000,   0.000,   0.000,'))
+        lines[486] = lines[486].replace('1.07000,   0.000,   0.000,', '1.07000,   0.000,  30.000,', 1)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'npcc48.raw')
+            with open(path, 'w') as f:
+                f.writelines(lines)
+            ss = System()
+            ss.undill_calls()
+            self.assertTrue(psse.read(ss, path))
+
+        uid = [i for i, (bus1, bus2) in enumerate(zip(ss.Line.bus1.v, ss.Line.bus2.v)) if (bus1, bus2) == (1, 21)]
+        self.assertEqual(len(uid), 1)
+        self.assertAlmostEqual(ss.Line.phi.v[uid[0]], np.pi / 6)
+        self.assertEqual(ss.Line.trans.v[uid[0]], 1)
+
+    def test_short_transformer(self):
+        with open(get_case('npcc/npcc48.raw'), 'r') as f:
+            lines = f.readlines()
+        lines[484] = '     1,    21\n'
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'npcc48.raw')
+            with open(path, 'w') as f:
+                f.writelines(lines)
+            ss = System()
+            ss.undill_calls()
+            with self.assertLogs('andes.io.psse', level='ERROR'):
+                self.assertFalse(psse.read(ss, path))
@@ -0,0 +1,18 @@
+import subprocess
+import sys
+import unittest
+
+from andes import cli
+
+
+class TestCLI(unittest.TestCase):
+    def test_hooks(self):
+        commands = cli.create_parser()._subparsers._group_actions[0].choices
+        self.assertEqual(set(commands), set(cli.command_hooks))
+        for command in commands:
+            self.assertTrue(callable(cli.get_hook(command)))
+
+    def test_light_import(self):
+        code = 'import sys, andes.cli, andes.main; print(sorted({"andes.system", "numpy"} & set(sys.modules)))'
+        ret = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, check=True)
+        self.assertEqual(ret.stdout.decode().strip(), '[]')
@@ -0,0 +1,71 @@
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from andes.variables.dae import DAETimeSeries
+
+
+class TestDAETimeSeries(unittest.TestCase):
+    def setUp(self) -> None:
+        self.ts = DAETimeSeries(chunk=4, dtype=np.float32, z_dtype=np.uint8)
+        self.t = np.arange(11) * 0.1
+        self.xy = np.random.rand(11, 3)
+        self.z = np.random.randint(0, 2, (11, 2))
+        for i in range(11):
+            self.ts.store_txyz(self.t[i], self.xy[i], self.z[i])
+
+    def test_grow(self):
+        self.assertEqual(len(self.ts), 11)
+        self.assertGreaterEqual(len(self.ts._t), 11)
+        self.assertEqual(self.ts.shape, (11, 6))
+        self.assertEqual(self.ts.xy.dtype, np.float32)
+        self.assertEqual(self.ts.z.dtype, np.uint8)
+
+        np.testing.assert_array_equal(self.ts.t, self.t)
+        np.testing.assert_array_almost_equal(self.ts.xy, self.xy, decimal=6)
+        np.testing.assert_array_equal(self.ts.z, self.z)
+        np.testing.assert_array_almost_equal(self.ts[:, [0, 3, 5]],
+                                             np.column_stack((self.t, self.xy[:, 2], self.z[:, 1])), decimal=6)
+
+    def test_df(self):
+        self.ts.dae = SimpleNamespace(xy_name=['a', 'b', 'c'], z_name=['p', 'q'])
+        df = self.ts.df
+        self.assertIs(self.ts.df, df)
+        self.assertIs(self.ts.df_z, self.ts.df_z)
+        np.testing.assert_array_equal(df.index, self.t)
+
+        self.ts.store_txyz(1.1, self.xy[0], self.z[0])
+        self.assertEqual(len(self.ts.df), 12)
+        self.assertEqual(len(self.ts.df_z), 12)
+
+        self.ts.truncate(5)
+        self.assertEqual(len(self.ts.df), 5)
+
+        self.ts.xy_idx = [2]
+        self.ts.set_arrays(self.t, self.xy[:, 2:], self.z)
+        self.assertEqual(list(self.ts.df.columns), ['c'])
+
+    def test_truncate(self):
+        self.ts.truncate(5)
+        np.testing.assert_array_equal(self.ts.t, self.t[:5])
+
+        self.ts.store_txyz(9.0, self.xy[0], self.z[0])
+        self.assertEqual(len(self.ts), 6)
+        self.assertEqual(self.ts.t[-1], 9.0)
+
+    def test_detach(self):
+        txyz = self.ts.txyz
+        self.assertEqual(txyz.dtype, np.float64)
+        self.assertIsNot(self.ts.txyz, txyz)
+
+        data = self.ts.detach()
+        np.testing.assert_array_equal(data, txyz)
+        self.assertEqual(len(self.ts), 0)
+        self.assertEqual(self.ts.shape, (0, 6))
+
+        self.ts.set_arrays(self.t[:2], self.xy[:2], self.z[:2])
+        self.assertEqual(self.ts.xy.dtype, np.float32)
+        self.assertEqual(self.ts.z.dtype, np.uint8)
+        self.ts.store_txyz(0.2, self.xy[2], self.z[2])
+        np.testing.assert_array_equal(self.ts.z, self.z[:3])
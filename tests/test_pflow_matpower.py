@@ -1,5 +1,6 @@
 import unittest
 import os
+import tempfile
 import andes
 from andes.utils.paths import get_case
 
@@ -16,3 +17,30 @@ class TestMATPOWER(unittest.TestCase):
         for case in self.cases:
             case_path = get_case(os.path.join('matpower', case))
             andes.main.run(case_path, no_output=True)
+
+
+class TestRunPool(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cases = [get_case(os.path.join('matpower', case)) for case in ('case14.m', 'case5.m', 'case118.m')]
+
+    def test_run_pool(self):
+        results = andes.main.run(self.cases, ncpu=2, no_output=True)
+        self.assertEqual([item.case for item in results], self.cases)
+        self.assertEqual([item.metrics['n_bus'] for item in results], [14, 5, 118])
+        for item in results:
+            self.assertEqual(item.status, 'ok')
+            self.assertTrue(item.metrics['pflow_converged'])
+            self.assertGreater(item.elapsed, 0)
+
+    def test_longest_first(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            broken = os.path.join(tmp, 'broken.m')
+            with open(broken, 'w') as f:
+                f.write('mpc.bus = [1 3 x];\n')
+            cases = self.cases + [broken]
+            results = andes.main._run_pool(cases, ncpu=2, longest_first=True, no_output=True)
+
+        self.assertEqual([item.case for item in results], cases)
+        self.assertEqual([item.status for item in results], ['ok', 'ok', 'ok', 'failed'])
+        self.assertEqual(results[2].metrics['n_bus'], 118)
+        self.assertIsNotNone(results[3].error)
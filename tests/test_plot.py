@@ -0,0 +1,219 @@
+import os
+import re
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import andes
+from andes.plot import TDSData, guess_event_index, minmax_index, tdsplot
+from andes.shared import mpl, plt
+from andes.utils.paths import get_case
+
+mpl.use('Agg')
+
+tmp = None
+out = None  # path to the npy output of a Kundur run
+
+
+def setUpModule():
+    global tmp, out
+    tmp = tempfile.TemporaryDirectory()
+    ss = andes.load(get_case('kundur/kundur_full.xlsx'), output_path=tmp.name)
+    ss.PFlow.run()
+    ss.TDS.config.tf = 3.0
+    ss.TDS.run()
+    out = ss.files.npy
+
+
+def tearDownModule():
+    tmp.cleanup()
+
+
+class TestTDSData(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data = TDSData(os.path.basename(out), path=tmp.name, cache_size=2)
+        self.ref = np.load(out)
+
+    def test_memmap(self):
+        self.assertIsInstance(self.data._data, np.memmap)
+        self.assertEqual(self.data.nvars, self.ref.shape[1])
+
+        for i in (1, 2, 3, 1, 5):
+            np.testing.assert_array_equal(self.data.get_values(i), self.ref[:, i])
+            self.assertLessEqual(len(self.data._cache), 2)
+        self.assertEqual(list(self.data._cache), [1, 5])
+
+        np.testing.assert_array_equal(self.data.get_values([0, 4]), self.ref[:, [0, 4]])
+        self.assertEqual(list(self.data._cache), [0, 4])
+
+        # more columns than the cache size are read without caching
+        np.testing.assert_array_equal(self.data.get_values([1, 2, 3]), self.ref[:, [1, 2, 3]])
+        self.assertEqual(list(self.data._cache), [0, 4])
+
+
+class TestFind(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data = TDSData(os.path.basename(out), path=tmp.name)
+
+    def linear_find(self, query, exclude=None, formatted=False):
+        names = self.data._uname if formatted is False else self.data._fname
+        found = [(idx, name) for idx, name in zip(self.data._idx, names)
+                 if re.search(query, name) and not (exclude and re.search(exclude, name))]
+        return [idx for idx, _ in found], [name for _, name in found]
+
+    def assert_find(self, queries):
+        for query, exclude, formatted in queries:
+            self.assertEqual(self.data.find(query, exclude=exclude, formatted=formatted),
+                             self.linear_find(query, exclude=exclude, formatted=formatted), query)
+
+    def test_find(self):
+        queries = set()
+        for name in self.data._uname:
+            tokens = name.split()
+            queries.update((' '.join(tokens[:i]), None, False) for i in range(1, len(tokens) + 1))
+        queries.update([('omega', None, False), ('omega 1', None, False), ('ROU omega', None, False),
+                        ('GENROU psia', None, False), ('GENROU', 'delta|omega', False),
+                        ('Bus v 1', 'Bus v 1$', False),
+                        (r'GENROU (omega|delta) \d', None, False), ('Time', None, False), ('1', None, False),
+                        ('omega', None, True), ('GENROU omega', None, True), ('Bus', 'Bus v', True)])
+        self.assert_find(sorted(queries, key=str))
+
+        # uid prefixes
+        names = [f'Bus v {i}' for i in range(12)] + [f'PVBus a {i}' for i in range(12)]
+        self.data._uname = self.data._fname = ['Time [s]'] + names
+        self.data._idx = list(range(len(names) + 1))
+        self.data._build_index()
+        self.assert_find([('Bus v 1', None, False), ('Bus a 1', None, False), ('Bus', None, False),
+                          ('v 1', None, False), ('Bus v 1', 'v 11', False), ('s v', None, False)])
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self) -> None:
+        try:
+            import pyarrow  # NOQA
+        except ImportError:
+            self.skipTest('pyarrow is not installed')
+        self.data = TDSData(os.path.basename(out), path=tmp.name)
+        self.ref = np.load(out)
+
+    def assert_table(self, table, idx):
+        self.assertEqual(table.column_names, [self.data._uname[i] for i in idx])
+        for i, field in zip(idx, table.schema):
+            self.assertEqual(field.metadata[b'tex_name'].decode(), self.data._fname[i])
+            self.assertEqual(int(field.metadata[b'idx']), i)
+            np.testing.assert_array_equal(table.column(field.name).to_pylist(), self.ref[:, i])
+
+    def test_export(self):
+        import pyarrow.feather  # NOQA
+        import pyarrow.parquet  # NOQA
+
+        path = os.path.join(tmp.name, 'export.parquet')
+        self.assertTrue(self.data.export('parquet', path=path))
+        self.assert_table(pyarrow.parquet.read_table(path), self.data._idx)
+
+        path = os.path.join(tmp.name, 'export.feather')
+        self.assertTrue(self.data.export('feather', path=path, idx=[0, 3, 5]))
+        self.assert_table(pyarrow.feather.read_table(path), [0, 3, 5])
+
+    def test_tdsplot_export(self):
+        import pyarrow.feather  # NOQA
+
+        tdsplot([out], y=['2'], export='feather')
+        path = os.path.splitext(out)[0] + '.feather'
+        self.assert_table(pyarrow.feather.read_table(path), [0, 2])
+
+
+class TestExportWithoutPyarrow(unittest.TestCase):
+    def test_export(self):
+        data = TDSData(os.path.basename(out), path=tmp.name)
+        path = os.path.join(tmp.name, 'missing.parquet')
+        modules = dict.fromkeys(('pyarrow', 'pyarrow.feather', 'pyarrow.parquet'))
+        with mock.patch.dict(sys.modules, modules):
+            with self.assertLogs('andes.plot', level='ERROR') as logs:
+                self.assertFalse(data.export('parquet', path=path))
+        self.assertIn('pyarrow', logs.output[0])
+        self.assertFalse(os.path.isfile(path))
+
+
+class TestDecimation(unittest.TestCase):
+    def test_minmax_index(self):
+        rng = np.random.RandomState(0)
+        ydata = rng.rand(1000, 2)
+        ydata[500, 0] = 5.0  # spike
+        keep = [123, 777]
+        rows = minmax_index(ydata, 100, keep=keep)
+
+        self.assertTrue(np.all(np.diff(rows) > 0))
+        self.assertLessEqual(len(rows), 2 + len(keep) + 100 * 2)
+        self.assertTrue(np.all(np.isin([0, 999, 500] + keep, rows)))
+
+        # the min and max of each column in each bucket are kept
+        bucket = np.arange(1000) * 50 // 1000
+        for b in range(50):
+            in_bucket = np.where(bucket == b)[0]
+            for col in ydata.T:
+                values = col[in_bucket]
+                kept = col[np.intersect1d(rows, in_bucket)]
+                self.assertEqual(kept.min(), values.min())
+                self.assertEqual(kept.max(), values.max())
+
+        np.testing.assert_array_equal(minmax_index(ydata[:100], 100), np.arange(100))
+        np.testing.assert_array_equal(minmax_index(ydata[:50, 0], 100), np.arange(50))
+
+    def test_guess_event_index(self):
+        ydata = np.ones((100, 2))
+        ydata[60:, 1] = 1 + np.arange(1, 41) * 2.5e-5  # slow deviation
+        np.testing.assert_array_equal(guess_event_index(ydata), [60])
+
+        ydata[30:, 0] = 1.5  # step change
+        np.testing.assert_array_equal(guess_event_index(ydata), [29, 30])
+        self.assertEqual(len(guess_event_index(np.ones((100, 2)))), 0)
+
+        rows = minmax_index(np.column_stack((ydata, np.arange(100))), 10, keep=guess_event_index(ydata))
+        self.assertTrue(np.all(np.isin([0, 29, 30, 99], rows)))
+
+    def test_max_points(self):
+        data = TDSData(os.path.basename(out), path=tmp.name)
+        n = len(data.get_values(0))
+
+        for max_points, expected in ((None, n), (10 * n, n), (20, None)):
+            fig, ax = data.plot([1, 2], max_points=max_points, show=False, latex=False)
+            npoints = len(ax.lines[0].get_xdata())
+            if expected is None:
+                self.assertLess(npoints, n)
+            else:
+                self.assertEqual(npoints, expected)
+            plt.close(fig)
+
+
+class TestBatchPlot(unittest.TestCase):
+    def test_batch_plot(self):
+        for ncpu in (1, 2):
+            with tempfile.TemporaryDirectory() as fig_dir:
+                spec = os.path.join(fig_dir, 'spec.yaml')
+                with open(spec, 'w') as f:
+                    f.write(f"- name: {os.path.join(fig_dir, 'omega.png')}\n"
+                            f"  y: GENROU omega\n"
+                            f"  ylabel: Speed [pu]\n"
+                            f"- name: {os.path.join(fig_dir, 'voltage')}\n"
+                            f"  y: [1, 2]\n"
+                            f"  grid: true\n"
+                            f"- name: {os.path.join(fig_dir, 'missing.png')}\n"
+                            f"  y: NotAModel\n")
+
+                # the serial path keeps the backend of the caller and opens no pyplot figure
+                mpl.use('svg')
+                saved = tdsplot([out], y=[], batch=spec, ncpu=ncpu)
+                self.assertEqual(mpl.get_backend(), 'svg')
+                self.assertEqual(plt.get_fignums(), [])
+                self.assertIsNone(andes.plot._batch_data)
+                mpl.use('Agg')
+
+                expected = [os.path.join(fig_dir, 'omega.png'), os.path.join(fig_dir, 'voltage.png')]
+                self.assertEqual(saved, expected)
+                for path in expected:
+                    self.assertTrue(os.path.isfile(path))
+                    self.assertGreater(os.path.getsize(path), 0)
@@ -0,0 +1,168 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import andes
+from andes.plot import TDSData
+from andes.utils.paths import get_case
+from andes.variables.stream import find_segments, load_segments
+
+
+def load_kundur(**kwargs):
+    ss = andes.load(get_case('kundur/kundur_full.xlsx'), **kwargs)
+    ss.PFlow.run()
+    return ss
+
+
+class TestResume(unittest.TestCase):
+    def test_progress(self):
+        ss = load_kundur(no_output=True)
+        ss.TDS.config.tf = 1.5
+        ss.TDS.run()
+
+        # resumed at 50% of the new end time
+        ss.TDS.config.tf = 3.0
+        ss.TDS.run(resume=True)
+        self.assertEqual(ss.TDS.pbar.initial, 50)
+        self.assertEqual(ss.TDS.pbar.n, 100)
+
+
+class TestStream(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        ref = load_kundur(no_output=True)
+        ref.TDS.config.tf = 2.5
+        ref.TDS.run()
+        self.ref = ref.dae.ts.txyz
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_stream(self):
+        ss = load_kundur(output_path=self.tmp.name)
+        ss.TDS.config.tf = 2.5
+        ss.TDS.config.stream = 1
+        ss.TDS.config.chunk = 16
+        ss.TDS.run()
+
+        self.assertEqual(find_segments(ss.files.npy), [])
+        np.testing.assert_array_equal(np.load(ss.files.npy), self.ref)
+
+    def test_stream_interrupted(self):
+        ss = load_kundur(output_path=self.tmp.name)
+        ss.TDS.config.tf = 2.5
+        ss.TDS.config.stream = 1
+        ss.TDS.config.chunk = 16
+
+        store_step = ss.TDS._store_step
+
+        def interrupt():
+            if len(ss.dae.ts) == 10 and ss.dae.t > 1.0:
+                raise KeyboardInterrupt
+            store_step()
+
+        ss.TDS._store_step = interrupt
+        self.assertRaises(KeyboardInterrupt, ss.TDS.run)
+
+        self.assertFalse(os.path.isfile(ss.files.npy))
+        self.assertGreater(len(find_segments(ss.files.npy)), 1)
+        data = load_segments(ss.files.npy)
+        np.testing.assert_array_equal(data, self.ref[:len(data)])
+
+
+class TestOutputInterval(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        ref = load_kundur(no_output=True)
+        ref.TDS.config.tf = 3.0
+        ref.TDS.run()
+        cls.t = np.array(ref.dae.ts.t)
+        cls.xy = np.array(ref.dae.ts.xy)
+        cls.h = ref.TDS.config.tstep
+
+    def run_tds(self, **config):
+        ss = load_kundur(no_output=True)
+        ss.TDS.config.tf = 3.0
+        for key, val in config.items():
+            setattr(ss.TDS.config, key, val)
+        ss.TDS.run()
+        return ss
+
+    def test_tout(self):
+        ss = self.run_tds(tout=0.1, event_win=0)
+        t = ss.dae.ts.t
+
+        # the first step past each grid point is stored
+        grid = np.arange(0, self.t[-1], 0.1)
+        expected = self.t[np.unique(np.searchsorted(self.t, grid - 1e-8))]
+        np.testing.assert_array_almost_equal(t, expected)
+        self.assertLess(len(t), len(self.t) / 2)
+
+        # each step is stored once if several grid points are crossed in one step
+        ss = self.run_tds(tout=0.01, event_win=0)
+        np.testing.assert_array_almost_equal(ss.dae.ts.t, self.t)
+
+    def test_event_win(self):
+        ss = self.run_tds(tout=0.5, event_win=0.1)
+        t = ss.dae.ts.t
+
+        near = self.t[np.abs(self.t - 2.0) <= 0.1 + 1e-8]
+        self.assertGreater(len(near), 2)
+        self.assertTrue(np.all(np.isin(near, t)))
+        for tk in np.arange(0, self.t[-1], 0.5):
+            self.assertTrue(np.any((t >= tk - 1e-8) & (t < tk + self.h + 1e-8)))
+        self.assertLess(len(t), len(self.t) / 2)
+
+    def test_interp(self):
+        ss = self.run_tds(tout=0.1, interp=1, event_win=0)
+        t = ss.dae.ts.t
+
+        np.testing.assert_array_almost_equal(t, np.arange(len(t)) * 0.1)
+        # compare before the event, where the reference steps are continuous
+        before = t < 2.0 - self.h
+        for i in range(self.xy.shape[1]):
+            np.testing.assert_array_almost_equal(ss.dae.ts.xy[before, i],
+                                                 np.interp(t[before], self.t, self.xy[:, i]))
+
+
+class TestCompactOutput(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def run_tds(self, **config):
+        ss = load_kundur(output_path=self.tmp.name)
+        ss.config.store_z = 1
+        ss.TDS.config.tf = 2.5
+        for key, val in config.items():
+            setattr(ss.TDS.config, key, val)
+        ss.TDS.run()
+        return ss
+
+    def test_npz(self):
+        ref = self.run_tds()
+        ref_data = np.load(ref.files.npy)
+        nxy = ref.dae.n + ref.dae.m
+        self.assertGreater(ref.dae.o, 0)
+
+        for compress in (0, 1):
+            ss = self.run_tds(compact=1, compress=compress)
+            npz = os.path.splitext(ss.files.npy)[0] + '.npz'
+            self.assertTrue(os.path.isfile(npz))
+            self.assertFalse(os.path.isfile(ss.files.npy))
+
+            data = TDSData(os.path.basename(npz), path=self.tmp.name)
+            ts = data._data
+            self.assertEqual(ts.xy.dtype, np.float32)
+            self.assertEqual(ts.z.dtype, np.uint8)
+            self.assertEqual(ts.shape, ref_data.shape)
+
+            np.testing.assert_array_equal(ts.t, ref_data[:, 0])
+            np.testing.assert_allclose(ts.xy, ref_data[:, 1:1 + nxy], rtol=1e-6, atol=1e-6)
+            np.testing.assert_array_equal(ts.z, ref_data[:, 1 + nxy:])
+            np.testing.assert_allclose(data.get_values([0, 3, nxy + 1]), ref_data[:, [0, 3, nxy + 1]],
+                                       rtol=1e-6, atol=1e-6)